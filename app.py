@@ -1,85 +1,53 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
-from urllib.parse import urlparse
-from langdetect import detect
-from deep_translator import GoogleTranslator
-import wikipedia
-
-from services.predictor import predict_news
-from services.url_extractor import extract_text_from_url
-from services.news_verifier import fetch_related_articles
-from utils.text_cleaner import clean_text
-from services.summary_generator import simple_summary
-from services.explainability import clickbait_score, explain_prediction
-from services.credibility_score import compute_credibility_score
-from services.feedback_logger import save_feedback
+
+from services.explainability import explain_prediction
+from services.feedback_logger import import_legacy, save_feedback
+from services.pipeline import analysis_key, analyze_progressively, check_domain, extract
+from services.single_flight import SingleFlightTimeout
+from services import bulk
+from services.history_store import HistoryStore
+from config import HISTORY_CAPACITY, HISTORY_DB, HISTORY_PAGE_SIZE
 
 
 # ────────────────────────────────────────────────
 # Initialize session state history
 # ────────────────────────────────────────────────
 if "history" not in st.session_state:
-    st.session_state.history = []
+    st.session_state.history = HistoryStore(HISTORY_CAPACITY, HISTORY_DB)
+
+# Analyses of this session keyed by analysis_key(), oldest first
+if "results" not in st.session_state:
+    st.session_state.results = {}
+
+MAX_STORED_RESULTS = 20
+
+# Feedback saved by older versions to feedback.csv moves into the feedback
+# database once per server process, not on a click
+st.cache_resource(show_spinner=False)(import_legacy)("feedback.csv")
+
+# Text extracted for the URL in the box, kept so "Verify Now" (another
+# rerun) still sees it: {"url": ..., "text": ...}. It is what gets verified
+# until the user edits the pasted text or the URL.
+if "extracted" not in st.session_state:
+    st.session_state.extracted = None
 
 
 # ────────────────────────────────────────────────
 # HELPER FUNCTIONS
 # ────────────────────────────────────────────────
 
-def check_domain(url: str):
-    try:
-        domain = urlparse(url).netloc.lower().replace("www.", "")
-        trusted = ["bbc.com", "reuters.com", "apnews.com", "thehindu.com",
-                   "ndtv.com", "timesofindia.indiatimes.com",
-                   "cnn.com", "nytimes.com", "washingtonpost.com"]
-        if any(td in domain for td in trusted):
-            return "trusted", domain
-        return "unknown", domain
-    except:
-        return "unknown", "unknown"
-
-
-def final_verdict(model_result, confidence, related_count, domain_status, original_text):
-    HIGH = 0.80
-    MID = 0.60
-    if len(original_text.split()) < 25 and "recommend" in original_text.lower():
-        return "REAL ✅ (General Fact Statement)"
-    if related_count >= 2:
-        return "REAL ✅ (Sources Verified)"
-    if domain_status == "trusted" and model_result == "Real News" and confidence >= MID:
-        return "REAL ✅ (Trusted Domain)"
-    if model_result == "Fake News" and confidence >= HIGH and related_count == 0:
-        return "FAKE ❌ (No Sources Found)"
-    return "UNCERTAIN ⚠️ (Needs Manual Check)"
-
-
-def strict_relax_decision(real_prob, fake_prob, mode):
-    diff = abs(real_prob - fake_prob)
-    if mode == "Strict 🔥" and diff < 0.15:
-        return "Uncertain", max(real_prob, fake_prob)
-    if fake_prob > real_prob:
-        return "Fake News", fake_prob
-    return "Real News", real_prob
-
-
-def translate_to_english(text):
-    try:
-        lang = detect(text)
-        if lang != "en":
-            translated = GoogleTranslator(source="auto", target="en").translate(text)
-            return translated, lang
-        return text, "en"
-    except Exception as e:
-        st.warning(f"Translation failed: {str(e)}")
-        return text, "unknown"
-
-
-def wiki_fact_check(query):
-    try:
-        return wikipedia.summary(query, sentences=2)
-    except:
-        return None
+def forget_extracted():
+    st.session_state.extracted = None
+
+
+def store_analysis(key, analysis):
+    results = st.session_state.results
+    results.pop(key, None)
+    results[key] = analysis
+    # Keep only the most recent analyses of this session
+    while len(results) > MAX_STORED_RESULTS:
+        results.pop(next(iter(results)))
 
 
 # ────────────────────────────────────────────────
@@ -281,6 +249,64 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# ────────────────────────────────────────────────
+# BULK MODE
+# ────────────────────────────────────────────────
+def current_bulk_job():
+    # the id is also kept in the URL, so a page reload finds a running job again
+    job_id = st.session_state.get("bulk_job_id") or st.query_params.get("bulk_job")
+    return bulk.get_job(job_id) if job_id else None
+
+
+def render_bulk_progress():
+    job = current_bulk_job()
+    if job is None:
+        return
+
+    st.progress(job.done / max(1, job.total), text=f"{job.done}/{job.total} verified • {job.status}")
+    st.dataframe(job.results(), hide_index=True, use_container_width=True)
+
+    if job.running:
+        st.button("Stop", on_click=job.cancel)
+        return
+    if job.status == "failed":
+        st.error(f"Bulk verification failed: {job.error}")
+    if job.done:
+        st.download_button(
+            "Download results (CSV)",
+            job.csv_bytes(),
+            f"fakeguard_bulk_{job.id}.csv",
+            "text/csv"
+        )
+    if st.session_state.get("bulk_polling"):
+        # finished since the last full run: redraw once more without the timer
+        st.session_state.bulk_polling = False
+        st.rerun()
+
+
+def render_bulk_tab(mode, enable_translate):
+    uploaded = st.file_uploader(
+        "CSV or JSON-lines file with a text and/or url column (optional id)",
+        type=["csv", "jsonl", "ndjson"]
+    )
+    if uploaded is not None and st.button("Start bulk verification", use_container_width=True):
+        try:
+            rows = bulk.read_bulk_input(uploaded.getvalue(), uploaded.name)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            job = bulk.submit(rows, mode, enable_translate)
+            st.session_state.bulk_job_id = job.id
+            st.query_params["bulk_job"] = job.id
+
+    job = current_bulk_job()
+    if job is not None:
+        # results stream in: the fragment re-runs on its own every second
+        # while the job is running, without rerunning the whole page
+        st.session_state.bulk_polling = job.running
+        st.fragment(run_every=1.0 if job.running else None)(render_bulk_progress)()
+
+
 # ────────────────────────────────────────────────
 # MAIN CONTENT
 # ────────────────────────────────────────────────
@@ -289,7 +315,7 @@ col = st.columns([1, 10, 1])[1]
 with col:
     st.markdown('<div class="section-title">Analyze News</div>', unsafe_allow_html=True)
 
-    tab1, tab2 = st.tabs(["Paste Text", "From URL"])
+    tab1, tab2, tab3 = st.tabs(["Paste Text", "From URL", "Bulk (CSV / JSONL)"])
 
     news_text = ""
     url = ""
@@ -301,29 +327,43 @@ with col:
             label="",
             height=280,
             placeholder="Paste the full news article here… (longer text = better accuracy)",
-            key="text_area"
+            key="text_area",
+            on_change=forget_extracted
         )
+        if st.session_state.extracted is not None:
+            st.caption("Verifying the article extracted from the URL tab. Edit this text to verify it instead.")
 
     with tab2:
-        url = st.text_input("News URL", placeholder="https://...", key="url_input")
+        url = st.text_input("News URL", placeholder="https://...", key="url_input", on_change=forget_extracted)
 
         if url.strip():
             domain_status, domain_name = check_domain(url)
             if domain_status == "trusted":
                 st.success(f"Trusted source • {domain_name}")
+            elif domain_status == "suspicious":
+                st.warning(f"Known unreliable source • {domain_name}")
             else:
                 st.info(f"Domain: {domain_name}")
 
             if st.button("Extract content"):
                 with st.spinner("Extracting article…"):
                     try:
-                        news_text = extract_text_from_url(url)
+                        # sessions asking for the same page at once share one download
+                        text = extract(url)
+                        st.session_state.extracted = {"url": url, "text": text}
                         st.success("Article extracted successfully")
                         with st.expander("Article preview", expanded=True):
-                            st.markdown(news_text[:1800] + "…")
+                            st.markdown(text[:1800] + "…")
                     except Exception as e:
                         st.error(f"Extraction failed: {str(e)}")
 
+            extracted = st.session_state.extracted
+            if extracted is not None and extracted["url"] == url:
+                news_text = extracted["text"]
+
+    with tab3:
+        render_bulk_tab(mode, enable_translate)
+
     b1, b2 = st.columns([5, 2])
     with b1:
         verify = st.button("🔍 Verify Now", type="primary", use_container_width=True)
@@ -335,145 +375,227 @@ with col:
 # ────────────────────────────────────────────────
 # PREDICTION & RESULTS
 # ────────────────────────────────────────────────
-if verify and news_text.strip():
-    with col:
-        with st.spinner("Analyzing article… Please wait"):
-            if enable_translate:
-                translated_text, detected_lang = translate_to_english(news_text)
-                if detected_lang not in ["en", "unknown"]:
-                    st.info(f"🌍 Language detected: **{detected_lang}** → Translated to English ✅")
-                news_text = translated_text
+def render_notices(analysis):
+    if analysis["degraded"]:
+        st.warning("⚠️ Partial result — some checks were unavailable: " + ", ".join(
+            f"{dependency} ({reason})" for dependency, reason in analysis["degraded"]))
+
+    if analysis["duplicate_similarity"] is not None:
+        st.info(f"♻️ Near-duplicate of an article verified earlier "
+                f"({analysis['duplicate_similarity']:.0%} similar) — reusing its model result and sources")
+
+    if analysis["detected_lang"] not in ["en", "unknown"]:
+        st.info(f"🌍 Language detected: **{analysis['detected_lang']}** → Translated to English ✅")
+
+
+def render_result_card(analysis):
+    verdict = analysis["verdict"]
+
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">Analysis Result</div>', unsafe_allow_html=True)
+
+    cols = st.columns([2, 2, 2, 3])
+    cols[0].metric("Model", analysis["result"])
+    cols[1].metric("Mode", analysis["adjusted_label"])
+    cols[2].metric("Confidence", f"{analysis['confidence']*100:.0f}%")
+    with cols[3]:
+        if verdict is None:
+            st.markdown('<div class="verdict-pill uncertain">⏳ Checking sources…</div>', unsafe_allow_html=True)
+        elif "REAL" in verdict:
+            st.markdown(f'<div class="verdict-pill real">{verdict}</div>', unsafe_allow_html=True)
+        elif "FAKE" in verdict:
+            st.markdown(f'<div class="verdict-pill fake">{verdict}</div>', unsafe_allow_html=True)
+        else:
+            st.markdown(f'<div class="verdict-pill uncertain">{verdict}</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_probability_card(analysis):
+    real_prob, fake_prob = analysis["real_prob"], analysis["fake_prob"]
+
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">Probability Breakdown</div>', unsafe_allow_html=True)
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown("**Real News**")
+        st.progress(real_prob)
+        st.caption(f"{real_prob*100:.0f}%")
+    with c2:
+        st.markdown("**Fake News**")
+        st.progress(fake_prob)
+        st.caption(f"{fake_prob*100:.0f}%")
+
+    st.subheader("Probability Graph")
+    chart_df = pd.DataFrame({"Probability": [real_prob, fake_prob]}, index=["Real", "Fake"])
+    st.bar_chart(chart_df)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_signals_card(analysis):
+    cb_score, cb_level = analysis["cb_score"], analysis["cb_level"]
+
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title">Summary & Key Signals</div>', unsafe_allow_html=True)
+
+    st.markdown("**Summary**  \n" + analysis["summary_text"])
+
+    cols = st.columns(2)
+    with cols[0]:
+        st.caption("Clickbait level")
+        st.write(f"**{cb_level}**  ({cb_score}/100)")
+        st.progress(cb_score / 100)
+    with cols[1]:
+        st.caption("Credibility score")
+        if analysis["cred_score"] is None:
+            st.caption("⏳ waiting for related sources…")
+        else:
+            st.metric("", f"{analysis['cred_score']}/100")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_sources_card(analysis):
+    related = analysis["related"]
+    pending = analysis["pending"]
+    if not (related or analysis["wiki_enabled"] or pending):
+        return
+
+    with st.expander("Verification Sources & Context", expanded=True):
+        if related is None:
+            st.info("🔎 Searching for related coverage…")
+        elif related:
+            st.success(f"Found {len(related)} related articles")
+            for art in related[:5]:
+                match = f" — {art['similarity']:.0%} match" if "similarity" in art else ""
+                st.markdown(f"• [{art['title']}]({art['link']}){match}")
+        else:
+            st.warning("No corroborating sources found")
+
+        if analysis["wiki_enabled"]:
+            st.markdown("**Wikipedia context**")
+            if "wiki_text" in pending:
+                st.caption("⏳ Looking up Wikipedia…")
+            else:
+                st.write(analysis["wiki_text"] or "— no relevant entry found —")
 
-            cleaned_text = clean_text(news_text)
 
-            result, confidence, real_prob, fake_prob = predict_news(cleaned_text)
+def render_actions(analysis):
+    if analysis["pending"]:
+        return
 
-            adjusted_label, adjusted_conf = strict_relax_decision(real_prob, fake_prob, mode)
+    news_text = analysis["news_text"]
+    verdict = analysis["verdict"]
+    result, confidence = analysis["result"], analysis["confidence"]
+    real_prob, fake_prob = analysis["real_prob"], analysis["fake_prob"]
 
-            query = " ".join(news_text.split()[:18])
-            related = fetch_related_articles(query)
+    # ── FEEDBACK + DOWNLOAD ──
+    st.markdown('<div class="card">', unsafe_allow_html=True)
 
-            verdict = final_verdict(result, confidence, len(related), domain_status, news_text)
+    fb1, fb2 = st.columns(2)
+    with fb1:
+        if st.button("✅ This result seems correct", use_container_width=True):
+            save_feedback("feedback.csv", news_text, verdict, "Correct")
+            st.success("Thank you!")
+    with fb2:
+        if st.button("❌ Something looks wrong", use_container_width=True):
+            save_feedback("feedback.csv", news_text, verdict, "Wrong")
+            st.success("Thank you for the feedback")
 
-            st.session_state.history.insert(0, {
-                "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "input_type": "URL" if url else "Text",
-                "domain": domain_name,
-                "model_result": result,
-                "mode_result": adjusted_label,
-                "confidence": round(confidence * 100, 2),
-                "real_prob": round(real_prob * 100, 2),
-                "fake_prob": round(fake_prob * 100, 2),
-                "final_verdict": verdict
-            })
-
-        # ── RESULTS ──
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="section-title">Analysis Result</div>', unsafe_allow_html=True)
-
-        cols = st.columns([2, 2, 2, 3])
-        cols[0].metric("Model", result)
-        cols[1].metric("Mode", adjusted_label)
-        cols[2].metric("Confidence", f"{confidence*100:.0f}%")
-        with cols[3]:
-            if "REAL" in verdict:
-                st.markdown(f'<div class="verdict-pill real">{verdict}</div>', unsafe_allow_html=True)
-            elif "FAKE" in verdict:
-                st.markdown(f'<div class="verdict-pill fake">{verdict}</div>', unsafe_allow_html=True)
-            else:
-                st.markdown(f'<div class="verdict-pill uncertain">{verdict}</div>', unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="section-title">Probability Breakdown</div>', unsafe_allow_html=True)
-
-        c1, c2 = st.columns(2)
-        with c1:
-            st.markdown("**Real News**")
-            st.progress(real_prob)
-            st.caption(f"{real_prob*100:.0f}%")
-        with c2:
-            st.markdown("**Fake News**")
-            st.progress(fake_prob)
-            st.caption(f"{fake_prob*100:.0f}%")
-
-        st.subheader("Probability Graph")
-        chart_df = pd.DataFrame({"Probability": [real_prob, fake_prob]}, index=["Real", "Fake"])
-        st.bar_chart(chart_df)
-        st.markdown('</div>', unsafe_allow_html=True)
-
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="section-title">Summary & Key Signals</div>', unsafe_allow_html=True)
-
-        summary_text = simple_summary(news_text, max_sentences=3)
-        st.markdown("**Summary**  \n" + summary_text)
-
-        cb_score, cb_level, cb_words = clickbait_score(news_text)
-        cred_score = compute_credibility_score(real_prob, fake_prob, len(related), domain_status, cb_score)
-
-        cols = st.columns(2)
-        with cols[0]:
-            st.caption("Clickbait level")
-            st.write(f"**{cb_level}**  ({cb_score}/100)")
-            st.progress(cb_score / 100)
-        with cols[1]:
-            st.caption("Credibility score")
-            st.metric("", f"{cred_score}/100")
-        st.markdown('</div>', unsafe_allow_html=True)
-
-        # ── SOURCES & WIKIPEDIA ──
-        if related or enable_wiki:
-            with st.expander("Verification Sources & Context", expanded=True):
-                if related:
-                    st.success(f"Found {len(related)} related articles")
-                    for art in related[:5]:
-                        st.markdown(f"• [{art['title']}]({art['link']})")
-                else:
-                    st.warning("No corroborating sources found")
-
-                if enable_wiki:
-                    st.markdown("**Wikipedia context**")
-                    wiki_text = wiki_fact_check(" ".join(cleaned_text.split()[:8]))
-                    st.write(wiki_text or "— no relevant entry found —")
-
-        # ── FEEDBACK + DOWNLOAD ──
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-
-        fb1, fb2 = st.columns(2)
-        with fb1:
-            if st.button("✅ This result seems correct", use_container_width=True):
-                save_feedback("feedback.csv", news_text, verdict, "Correct")
-                st.success("Thank you!")
-        with fb2:
-            if st.button("❌ Something looks wrong", use_container_width=True):
-                save_feedback("feedback.csv", news_text, verdict, "Wrong")
-                st.success("Thank you for the feedback")
-
-        # ── IMPORTANT: Define report_text here ──
-        report_text = f"""FakeGuard Report ─ {datetime.now():%Y-%m-%d %H:%M}
+    # ── IMPORTANT: Define report_text here ──
+    report_text = f"""FakeGuard Report ─ {analysis['time']:%Y-%m-%d %H:%M}
 ═══════════════════════════════════════
-Input:      {"URL" if url else "Text"}
-Domain:     {domain_name}
+Input:      {analysis['input_type']}
+Domain:     {analysis['domain']}
 Verdict:    {verdict}
 Model:      {result}  ({confidence*100:.0f}%)
-Mode:       {adjusted_label}
+Mode:       {analysis['adjusted_label']}
 Real / Fake: {real_prob*100:.0f}% / {fake_prob*100:.0f}%
-Credibility: {cred_score}/100
-Clickbait:  {cb_level} ({cb_score}/100)
-Sources:    {len(related)}
+Credibility: {analysis['cred_score']}/100
+Clickbait:  {analysis['cb_level']} ({analysis['cb_score']}/100)
+Sources:    {len(analysis['related'])}
 
 Summary:
-{summary_text}
+{analysis['summary_text']}
 """
 
-        st.download_button(
-            label="Download full report (.txt)",
-            data=report_text,
-            file_name=f"fakeguard_{datetime.now():%Y%m%d_%H%M}.txt",
-            mime="text/plain",
-            use_container_width=True
-        )
-        st.markdown('</div>', unsafe_allow_html=True)
+    st.download_button(
+        label="Download full report (.txt)",
+        data=report_text,
+        file_name=f"fakeguard_{analysis['time']:%Y%m%d_%H%M}.txt",
+        mime="text/plain",
+        use_container_width=True
+    )
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+CARDS = [
+    ("notices", render_notices),
+    ("result", render_result_card),
+    ("probabilities", render_probability_card),
+    ("signals", render_signals_card),
+    ("sources", render_sources_card),
+    ("actions", render_actions),
+]
+
+
+def analysis_slots():
+    """
+    One placeholder per card, so cards can be redrawn in place as data arrives.
+    """
+    return {name: st.empty() for name, _ in CARDS}
+
+
+def render_analysis(analysis, slots=None):
+    slots = slots or analysis_slots()
+    for name, render in CARDS:
+        with slots[name].container():
+            render(analysis)
+
+
+# Results are kept per session and keyed by input + settings, so reruns
+# triggered by the feedback / download buttons redraw instead of recomputing
+analysis = None
+slots = None
+if news_text.strip():
+    key = analysis_key(news_text, url, mode, enable_translate, enable_wiki)
+    if verify:
+        analysis = st.session_state.results.get(key)
+        if analysis is None:
+            with col:
+                with st.spinner("Analyzing article… Please wait"):
+                    # cards fill in as their data arrives: the model first,
+                    # slow lookups last
+                    slots = analysis_slots()
+                    # identical requests from other sessions wait for this one;
+                    # partial results are drawn here, outside the shared call
+                    try:
+                        for analysis in analyze_progressively(news_text, url, domain_status, domain_name,
+                                                              mode, enable_translate, enable_wiki):
+                            if analysis["pending"]:
+                                render_analysis(analysis, slots)
+                    except SingleFlightTimeout:
+                        st.error("The same article is already being analyzed and it is taking too long. Please try again.")
+                        st.stop()
+            store_analysis(key, analysis)
+
+            st.session_state.history.add({
+                "time": analysis["time"].strftime("%Y-%m-%d %H:%M:%S"),
+                "input_type": analysis["input_type"],
+                "domain": domain_name,
+                "model_result": analysis["result"],
+                "mode_result": analysis["adjusted_label"],
+                "confidence": round(analysis["confidence"] * 100, 2),
+                "real_prob": round(analysis["real_prob"] * 100, 2),
+                "fake_prob": round(analysis["fake_prob"] * 100, 2),
+                "final_verdict": analysis["verdict"]
+            })
+        st.session_state.last_analysis_key = key
+    elif st.session_state.get("last_analysis_key") == key:
+        analysis = st.session_state.results.get(key)
+
+if analysis is not None:
+    with col:
+        render_analysis(analysis, slots)
 
 
 # ────────────────────────────────────────────────
@@ -483,22 +605,25 @@ with col:
     st.markdown("<hr>", unsafe_allow_html=True)
     st.markdown('<div class="section-title">Recent Checks</div>', unsafe_allow_html=True)
 
-    if not st.session_state.history:
+    history = st.session_state.history
+    if not len(history):
         st.info("No analyses yet. Try verifying an article!")
     else:
-        df = pd.DataFrame(st.session_state.history)
+        page = 1
+        if history.pages(HISTORY_PAGE_SIZE) > 1:
+            page = st.number_input("Page", min_value=1, max_value=history.pages(HISTORY_PAGE_SIZE), value=1)
         st.dataframe(
-            df,
+            history.page(page, HISTORY_PAGE_SIZE),
             column_config={
                 "time": st.column_config.TextColumn("Time"),
-                "input": st.column_config.TextColumn("Type"),
+                "input_type": st.column_config.TextColumn("Type"),
                 "domain": "Domain",
-                "model": "Model",
-                "mode": "Mode",
+                "model_result": "Model",
+                "mode_result": "Mode",
                 "confidence": st.column_config.NumberColumn("Conf", format="%.0f%%"),
-                "real": st.column_config.NumberColumn("Real", format="%.0f%%"),
-                "fake": st.column_config.NumberColumn("Fake", format="%.0f%%"),
-                "verdict": "Verdict"
+                "real_prob": st.column_config.NumberColumn("Real", format="%.0f%%"),
+                "fake_prob": st.column_config.NumberColumn("Fake", format="%.0f%%"),
+                "final_verdict": "Verdict"
             },
             hide_index=True,
             use_container_width=True
@@ -506,7 +631,7 @@ with col:
 
         st.download_button(
             "Export history (CSV)",
-            df.to_csv(index=False).encode('utf-8'),
+            history.csv_bytes(),
             "fakeguard_history.csv",
             "text/csv"
-        )
\ No newline at end of file
+        )
@@ -1,10 +1,115 @@
 MODEL_PATH = "model/deberta"
 
-TRUSTED_SOURCES = [
-    "bbc.com",
-    "reuters.com",
-    "apnews.com",
-    "theguardian.com",
-    "nytimes.com",
-    "cnn.com"
-]
+# Trusted and suspicious news domains (see the file's header for the format)
+DOMAIN_REPUTATION_FILE = "data/domain-reputation.txt"
+
+FEATURE_STORE_DIR = "data/feature_store"
+# A version is compacted into one segment once it has more than this many
+FEATURE_STORE_MAX_SEGMENTS = 64
+
+# Seconds the verify flow waits for related-article search and Wikipedia
+VERIFY_DEADLINE = 12
+
+# Per-dependency timeouts (seconds) for outbound calls
+DEPENDENCY_TIMEOUTS = {
+    "ddgs": 8,
+    "translate": 10,
+    "wikipedia": 5,
+    "newspaper": 15,
+    "oxylabs": 20,
+}
+
+# Worker threads per dependency for guarded calls; a hung service can only
+# tie up its own threads
+DEPENDENCY_WORKERS = {
+    "newspaper": 16,
+}
+DEFAULT_DEPENDENCY_WORKERS = 8
+
+# Consecutive failures before a dependency's circuit opens, and how long it stays open
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 30
+
+# Local caches and process-shared state
+CACHE_DIR = ".cache"
+
+# Shared by every worker process: rate = tokens per second, burst = bucket
+# size, max_concurrency = ceiling for the adaptive in-flight limit
+RATE_LIMIT_DB = f"{CACHE_DIR}/rate_limits.sqlite3"
+RATE_LIMITS = {
+    "ddgs": {"rate": 1.0, "burst": 3, "max_concurrency": 4},
+    "oxylabs": {"rate": 5.0, "burst": 10, "max_concurrency": 8},
+    "translate": {"rate": 5.0, "burst": 10, "max_concurrency": 8},
+}
+
+TRANSLATION_CACHE_DB = f"{CACHE_DIR}/translations.sqlite3"
+
+# Compiled character n-gram profiles for services.language_id
+LANGID_PROFILE_CACHE = f"{CACHE_DIR}/langid_profiles.npz"
+
+# Built with `python -m services.wiki_index build <dump.jsonl>`; used instead
+# of the live Wikipedia API when present
+WIKI_INDEX_DB = "data/wiki_index.sqlite3"
+# A page is only returned when it contains at least this share of the
+# query's content words; otherwise the lookup finds nothing
+WIKI_MIN_COVERAGE = 0.5
+
+# Where fetch_related_articles looks: "ddgs" (live only), "index" (local
+# archive only) or "index+ddgs" (archive first, DDGS on a miss)
+RELATED_ARTICLES_BACKEND = "index+ddgs"
+NEWS_INDEX_DB = "data/news_index.sqlite3"
+# Share of query terms a local hit must contain to count as related
+NEWS_INDEX_MIN_COVERAGE = 0.5
+
+# Related articles only count as corroboration when the cosine similarity
+# of their embedding (title + snippet) to the input is at least this. None:
+# calibrated once per process for the loaded model on the labelled pairs in
+# SEMANTIC_CALIBRATION_PAIRS, as the cutoff that best separates related from
+# unrelated pairs (`python -m services.semantic_match` prints it); a number
+# pins it
+SEMANTIC_MATCH_THRESHOLD = None
+SEMANTIC_CALIBRATION_PAIRS = "data/semantic-pairs.txt"
+EMBEDDING_CACHE_DIR = f"{CACHE_DIR}/embeddings"
+
+# Concurrent identical verifications share one computation; waiters give
+# up after SINGLE_FLIGHT_TIMEOUT seconds
+SINGLE_FLIGHT_DIR = f"{CACHE_DIR}/single_flight"
+SINGLE_FLIGHT_TIMEOUT = 60
+
+# Article downloads: (connect, read) timeouts come from DEPENDENCY_TIMEOUTS
+# capped by URL_CONNECT_TIMEOUT; bodies over URL_MAX_BYTES are rejected
+URL_CONNECT_TIMEOUT = 5
+URL_MAX_BYTES = 5_000_000
+# Raw HTML + extracted text per URL, revalidated with ETag/Last-Modified
+# once older than URL_CACHE_FRESH_SECONDS and dropped after URL_CACHE_MAX_AGE
+URL_CACHE_DB = f"{CACHE_DIR}/pages.sqlite3"
+URL_CACHE_FRESH_SECONDS = 600
+URL_CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Extra clickbait phrases, one per line (";" comments), on top of
+# services.explainability.CLICKBAIT_WORDS. Off by default: a larger lexicon
+# changes every clickbait and credibility score. data/clickbait-phrases.txt
+# is an extended list to opt in with.
+CLICKBAIT_LEXICON = None
+
+# User feedback on verdicts; rows from a legacy feedback.csv are imported once
+FEEDBACK_DB = "data/feedback.sqlite3"
+
+# Checks kept per session for the "Recent Checks" table; set HISTORY_DB to
+# a path (e.g. "data/history.sqlite3") to also log every check there
+HISTORY_CAPACITY = 200
+HISTORY_DB = None
+HISTORY_PAGE_SIZE = 10
+
+# Bulk verification: rows per model batch / streamed update, and the time
+# budget for one chunk's downloads and lookups (rate limits apply)
+BULK_CHUNK_SIZE = 16
+BULK_CHUNK_DEADLINE = 60
+
+# HTTP API (services.api): most articles accepted by one /verify/batch call
+API_MAX_BATCH = 64
+
+# Command-line batch runner (python -m fakeguard verify): worker processes
+# (each loads its own model) and rows buffered per Parquet part file
+BATCH_WORKERS = 2
+BATCH_FLUSH_ROWS = 500
@@ -2,12 +2,31 @@ import pandas as pd
 import re
 import streamlit as st
 import numpy as np
-import pickle
 from assets import processing
+from services.forest_predictor import load_forest
+from services.feature_store import FeatureStore, content_hash
+from services.near_duplicate import NearDuplicateIndex
 
-# Load Model
-with open('model/random_forest_model.pkl', 'rb') as file:
-    loaded_data = pickle.load(file)
+
+# Load Model (unpickled and compiled once per server process)
+@st.cache_resource
+def get_forest():
+    return load_forest('model/random_forest_model.pkl')
+
+
+@st.cache_resource
+def get_feature_store():
+    return FeatureStore(version=processing.PIPELINE_VERSION)
+
+
+@st.cache_resource
+def get_duplicate_index():
+    return NearDuplicateIndex()
+
+
+loaded_data = get_forest()
+feature_store = get_feature_store()
+duplicate_index = get_duplicate_index()
 
 # ---------------- UI ----------------
 st.markdown(
@@ -35,9 +54,6 @@ if (not user_input_title or not user_input_title.strip()) and (not user_input_te
     st.error("Please enter a news title or news text before continuing.")
     st.stop()
 
-# Dataframe
-df = pd.DataFrame({'title': [user_input_title], 'text': [user_input_text], 'date': [" "] })
-
 # -------------- MAIN BUTTON --------------
 if st.button("Continue"):
 
@@ -49,20 +65,31 @@ if st.button("Continue"):
             st.error("News text is too short or invalid.")
             st.stop()
 
-        # Columns expected by model
-        columns_to_select = [
-            'dynamic_weighted_mean_similarity',
-            'spell_score',
-            'lexical_diversity_rate',
-            'sentiment_score',
-            'fake_bert_prediction'
-        ]
-
-        # Run pipeline
-        final_enriched_data = processing.process(df)
+        # Run pipeline (or reuse features computed for the same article,
+        # or a near-identical copy of its text under the same title, earlier).
+        # Search and similarity depend on the title, so a new title always
+        # goes through process_record, which only re-runs that branch.
+        record_key = content_hash(user_input_title, user_input_text, " ")
+        title_key = " ".join(user_input_title.lower().split())
+        record = feature_store.get(record_key)
+        duplicate = None
+        if record is None:
+            duplicate = duplicate_index.query(user_input_text, accept=lambda title: title == title_key)
+            if duplicate is not None:
+                record = feature_store.get(duplicate.key)
+        if record is None:
+            duplicate = None
+            record = processing.process_record(user_input_title, user_input_text, " ")
+            # without sources the search may just have failed; don't keep
+            # that as the article's features
+            if processing.has_sources(record):
+                feature_store.put(record_key, record)
+                duplicate_index.add(record_key, user_input_text, title_key)
+        if duplicate is not None:
+            st.info(f"Near-duplicate of an article checked earlier ({duplicate.similarity:.0%} similar); reusing its features.")
 
         # ----------- PREDICTION FIX -----------
-        predictions = loaded_data.predict(final_enriched_data[columns_to_select])
+        predictions = loaded_data.predict(processing.record_features(record))
 
         pred = predictions[0]   # extract label
 
@@ -79,26 +106,16 @@ if st.button("Continue"):
         col1, col2, col3 = st.columns(3)
         col4, col5 = st.columns(2)
 
-        col1.metric("FakeBERT Prediction", final_enriched_data['fake_bert_prediction'].iloc[0])
-        col2.metric("Lexical Diversity Rate", f"{final_enriched_data['lexical_diversity_rate'].iloc[0]:.2f}")
-        col3.metric("Spell Score", f"{final_enriched_data['spell_score'].iloc[0]:.2f}")
-        col4.metric("Sentiment Score", f"{final_enriched_data['sentiment_score'].iloc[0]:.2f}")
-        col5.metric("Weighted Cosine Similarity", f"{final_enriched_data['dynamic_weighted_mean_similarity'].iloc[0]:.2f}")
+        col1.metric("FakeBERT Prediction", record['fake_bert_prediction'])
+        col2.metric("Lexical Diversity Rate", f"{record['lexical_diversity_rate']:.2f}")
+        col3.metric("Spell Score", f"{record['spell_score']:.2f}")
+        col4.metric("Sentiment Score", f"{record['sentiment_score']:.2f}")
+        col5.metric("Weighted Cosine Similarity", f"{record['dynamic_weighted_mean_similarity']:.2f}")
 
         st.header("Final Result:")
         st.metric("Prediction", string)
 
-        # -------- Ensure URL columns exist --------
-        for i in range(1, 4):
-            col = f"scraped_news_{i}_url"
-            if col not in final_enriched_data.columns:
-                final_enriched_data[col] = ""
-
-        url_list = [
-            final_enriched_data['scraped_news_1_url'].iloc[0],
-            final_enriched_data['scraped_news_2_url'].iloc[0],
-            final_enriched_data['scraped_news_3_url'].iloc[0]
-        ]
+        url_list = [record.get(f"scraped_news_{i}_url", "") for i in range(1, processing.SCRAPED_SLOTS + 1)]
 
         st.header("Related News:")
 
@@ -107,7 +124,7 @@ if st.button("Continue"):
                 st.markdown(f"[{url}]({url})")
                 st.metric(
                     f"Cosine Similarity {i}",
-                    f"{final_enriched_data.get(f'similarity_score{i}', pd.Series([0])).iloc[0]:.2f}"
+                    f"{record.get(f'similarity_score{i}', 0):.2f}"
                 )
             else:
                 st.write("No related article found")
@@ -0,0 +1,115 @@
+"""
+HTTP API for the verification pipeline (services.pipeline).
+
+    uvicorn services.api:app --port 8000
+    FAKEGUARD_BACKENDS=stub uvicorn services.api:app   # offline: no model, no network
+    python -m services.api --stub
+
+    POST /verify         {"text": "...", "url": "...", "mode": "relax", "translate": true, "wiki": false}
+    POST /verify/batch   {"items": [{"id": "1", "text": "..."}, ...], "mode": "strict"}
+    GET  /health
+
+Requests run on the server's thread pool and share the process's model,
+caches and connection pools, so one worker process serves many at once.
+"""
+import argparse
+import os
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from config import API_MAX_BATCH
+from services import pipeline
+from services.backends import default_backends
+from services.single_flight import SingleFlightTimeout
+
+MODES = {"relax": pipeline.RELAX, "strict": pipeline.STRICT}
+
+
+class Options(BaseModel):
+    mode: Literal["relax", "strict"] = "relax"
+    translate: bool = True
+    wiki: bool = False
+
+
+class Article(BaseModel):
+    id: Optional[str] = None
+    text: str = ""
+    url: str = ""
+
+
+class VerifyRequest(Article, Options):
+    pass
+
+
+class BatchRequest(Options):
+    items: List[Article]
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # load the model before the first request rather than during it
+    await run_in_threadpool(default_backends)
+    yield
+
+
+app = FastAPI(title="FakeGuard API", lifespan=lifespan)
+
+
+def to_response(analysis, article_id=None):
+    response = jsonable_encoder(analysis)
+    if article_id is not None:
+        response["id"] = article_id
+    return response
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "backends": default_backends().name}
+
+
+@app.post("/verify")
+async def verify(request: VerifyRequest):
+    if not request.text.strip() and not request.url.strip():
+        raise HTTPException(422, "Either text or url is required")
+    try:
+        analysis = await run_in_threadpool(
+            pipeline.verify, request.text, request.url, MODES[request.mode],
+            request.translate, request.wiki)
+    except pipeline.ExtractionFailed as e:
+        raise HTTPException(502, str(e))
+    except SingleFlightTimeout:
+        raise HTTPException(503, "The same article is already being analyzed and it is taking too long")
+    return to_response(analysis, request.id)
+
+
+@app.post("/verify/batch")
+async def verify_batch(request: BatchRequest):
+    if not 1 <= len(request.items) <= API_MAX_BATCH:
+        raise HTTPException(422, f"A batch takes between 1 and {API_MAX_BATCH} items")
+    analyses = await run_in_threadpool(
+        pipeline.verify_batch,
+        [{"text": item.text, "url": item.url} for item in request.items],
+        MODES[request.mode], request.translate, request.wiki)
+    return {"results": [to_response(analysis, item.id) for item, analysis in zip(request.items, analyses)]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FakeGuard HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--stub", action="store_true", help="offline backends: no model, no network")
+    args = parser.parse_args()
+    if args.stub:
+        os.environ["FAKEGUARD_BACKENDS"] = "stub"
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+# Everything the verification pipeline calls out to. Swapping the whole set
+# lets the pipeline and API run offline (stub_backends) or in tests.
+Backends = namedtuple("Backends", [
+    "name",           # "live", "stub", ...; keeps their cached results apart
+    "predict",        # cleaned text -> (label, confidence, real_prob, fake_prob)
+    "predict_batch",  # [cleaned text] -> [predict(...)]
+    "related",        # (query, max_results, deadline) -> [article]
+    "corroborate",    # (cleaned text, [article]) -> [article that matches]
+    "wiki",           # (query, deadline) -> text or None
+    "translate",      # (text, deadline) -> (english text, language)
+    "extract",        # (url, deadline) -> article text
+])
+
+
+@lru_cache(maxsize=None)
+def live_backends():
+    # Imported here so the model is only loaded by whoever actually needs it
+    from services.news_verifier import fetch_related_articles
+    from services.predictor import predict_news, predict_news_batch
+    from services.semantic_match import corroborating
+    from services.translator import translate_to_english
+    from services.url_extractor import extract_text_from_url
+    from services.wiki_checker import wiki_fact_check
+
+    return Backends(
+        name="live",
+        predict=predict_news,
+        predict_batch=predict_news_batch,
+        related=fetch_related_articles,
+        corroborate=corroborating,
+        wiki=wiki_fact_check,
+        translate=translate_to_english,
+        extract=extract_text_from_url,
+    )
+
+
+def _stub_predict(text):
+    from services.explainability import clickbait_score
+
+    if not text or not text.strip():
+        return "No text provided", 0.0, 0.0, 0.0
+    # deterministic stand-in for the model: more clickbait, more "fake"
+    fake_prob = min(0.95, 0.25 + clickbait_score(text)[0] / 100 * 0.7)
+    real_prob = 1 - fake_prob
+    if fake_prob > real_prob:
+        return "Fake News", fake_prob, real_prob, fake_prob
+    return "Real News", real_prob, real_prob, fake_prob
+
+
+@lru_cache(maxsize=None)
+def stub_backends():
+    """
+    Offline backends: no model download, no network. Predictions come from
+    the clickbait score, lookups find nothing and texts aren't translated.
+    """
+    return Backends(
+        name="stub",
+        predict=_stub_predict,
+        predict_batch=lambda texts: [_stub_predict(text) for text in texts],
+        related=lambda query, max_results=5, deadline=None: [],
+        corroborate=lambda text, articles: articles,
+        wiki=lambda query, deadline=None: None,
+        translate=lambda text, deadline=None: (text, "en"),
+        extract=lambda url, deadline=None: "",
+    )
+
+
+def default_backends():
+    """
+    stub_backends() when FAKEGUARD_BACKENDS=stub, otherwise live_backends().
+    """
+    if os.environ.get("FAKEGUARD_BACKENDS", "live") == "stub":
+        return stub_backends()
+    return live_backends()
@@ -0,0 +1,304 @@
+"""
+Verify a JSON-lines dump from the command line, e.g. from cron:
+
+    python -m fakeguard verify in.jsonl -o out.parquet --workers 4
+    python -m fakeguard verify in.jsonl -o out.jsonl --stub
+
+Each input line is an object with a text (or content/body/article) and/or
+url (or link) field, and optionally an id (the line number otherwise).
+
+The input is streamed in chunks to worker processes, each of which runs
+services.bulk.verify_rows (services.pipeline.verify_batch, as in the app's
+bulk tab): one model batch per chunk, lookups run concurrently. Results
+are written as they arrive, to a directory of Parquet part files (output
+ending in .parquet) or appended to a JSON-lines file. Ctrl-C, SIGTERM or an error still writes out every row verified so
+far, and running the same command again skips ids already in the output,
+so an interrupted run picks up where it stopped.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context
+
+import pandas as pd
+
+from config import BATCH_FLUSH_ROWS, BATCH_WORKERS, BULK_CHUNK_SIZE
+from services.bulk import (FLOAT_COLUMNS, INT_COLUMNS, RESULT_COLUMNS, TEXT_COLUMNS, URL_COLUMNS, error_row,
+                           verify_rows)
+
+MODES = {"relax": "Relax ✅", "strict": "Strict 🔥"}
+
+
+def read_items(path):
+    """
+    Yield {"id", "text", "url"} per non-blank line of a JSON-lines file
+    ("-" for stdin), or {"id", "error"} for lines that can't be used.
+    """
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield {"id": str(number), "text": "", "url": "", "error": "invalid JSON"}
+                continue
+            if not isinstance(record, dict):
+                yield {"id": str(number), "text": "", "url": "", "error": "not a JSON object"}
+                continue
+            record = {str(k).strip().lower(): v for k, v in record.items()}
+            text = next((record[c] for c in TEXT_COLUMNS if record.get(c)), "")
+            url = next((record[c] for c in URL_COLUMNS if record.get(c)), "")
+            yield {"id": str(record.get("id", number)), "text": str(text), "url": str(url).strip()}
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _load_backends():
+    # worker initializer: load the model once per process, before any chunk
+    from services.backends import default_backends
+
+    default_backends()
+
+
+class JsonlOutput:
+    """
+    Rows appended to a JSON-lines file and flushed chunk by chunk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._drop_partial_line()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _drop_partial_line(self):
+        # a run killed mid-write can leave half a line at the end
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def done_ids(self):
+        done = set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(str(json.loads(line)["id"]))
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return done
+
+    def write(self, rows):
+        for row in rows:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetOutput:
+    """
+    Rows buffered and written as numbered part files in a directory, which
+    pandas.read_parquet reads back as one table.
+    """
+
+    def __init__(self, path, flush_rows=BATCH_FLUSH_ROWS):
+        if os.path.exists(path) and not os.path.isdir(path):
+            raise ValueError(f"{path} exists and is not a directory of Parquet parts")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.flush_rows = flush_rows
+        self._rows = []
+        self._parts = sorted(name for name in os.listdir(path) if name.endswith(".parquet"))
+
+    def done_ids(self):
+        done = set()
+        for name in self._parts:
+            done.update(pd.read_parquet(os.path.join(self.path, name), columns=["id"])["id"])
+        return done
+
+    def write(self, rows):
+        self._rows.extend(rows)
+        if len(self._rows) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        table = pd.DataFrame(self._rows, columns=RESULT_COLUMNS)
+        # fixed types, so parts written by different runs read back as one table
+        table = table.astype({column: "float64" for column in FLOAT_COLUMNS})
+        table = table.astype({column: "int64" for column in INT_COLUMNS})
+        name = f"part-{len(self._parts):05d}.parquet"
+        tmp = os.path.join(self.path, f".{name}.tmp")
+        table.to_parquet(tmp, index=False)
+        os.replace(tmp, os.path.join(self.path, name))
+        self._parts.append(name)
+        self._rows = []
+
+    def close(self):
+        self.flush()
+
+
+def open_output(path, flush_rows=BATCH_FLUSH_ROWS):
+    if path.rstrip("/").endswith(".parquet"):
+        return ParquetOutput(path, flush_rows)
+    return JsonlOutput(path)
+
+
+def chunks(items, done, size, stats):
+    chunk = []
+    for item in items:
+        stats["read"] += 1
+        if item["id"] in done:
+            stats["skipped"] += 1
+            continue
+        done.add(item["id"])
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(input_path, output_path, workers=BATCH_WORKERS, batch_size=BULK_CHUNK_SIZE, mode="Relax ✅",
+        enable_translate=True, enable_wiki=False, flush_rows=BATCH_FLUSH_ROWS):
+    """
+    Verify every item of `input_path` not yet in `output_path`. With
+    workers=0 everything runs in this process. Returns the run's counters.
+    """
+    output = open_output(output_path, flush_rows)
+    stats = Counter()
+    verdicts = Counter()
+    started = time.monotonic()
+
+    def record(rows):
+        output.write(rows)
+        for row in rows:
+            stats["verified"] += 1
+            if row["degraded"]:
+                stats["partial"] += 1
+            elif row["error"]:
+                stats["errors"] += 1
+            else:
+                verdicts[row["verdict"]] += 1
+
+    pending = chunks(read_items(input_path), output.done_ids(), batch_size, stats)
+    try:
+        if workers == 0:
+            for chunk in pending:
+                record(_split_errors(chunk, mode, enable_translate, enable_wiki, verify_rows))
+        else:
+            _run_pool(pending, workers, mode, enable_translate, enable_wiki, record, stats)
+    except KeyboardInterrupt:
+        stats["interrupted"] = 1
+    finally:
+        output.close()
+        stats["seconds"] = time.monotonic() - started
+        stats.update({f"verdict: {verdict}": n for verdict, n in verdicts.items()})
+    return stats
+
+
+def _split_errors(chunk, mode, enable_translate, enable_wiki, func):
+    # input lines that failed to parse never reach the pipeline
+    bad = [error_row(item, item["error"]) for item in chunk if "error" in item]
+    good = [item for item in chunk if "error" not in item]
+    return bad + (func(good, mode, enable_translate, enable_wiki) if good else [])
+
+
+def _run_pool(pending, workers, mode, enable_translate, enable_wiki, record, stats):
+    # spawn, not fork: the parent's thread pools and sockets don't survive a fork
+    pool = ProcessPoolExecutor(workers, mp_context=get_context("spawn"), initializer=_load_backends)
+    futures = {}
+    try:
+        while True:
+            # keep two chunks per worker queued; reading ahead further
+            # would just hold the input in memory
+            for chunk in pending:
+                futures[pool.submit(_split_errors, chunk, mode, enable_translate, enable_wiki,
+                                    verify_rows)] = chunk
+                if len(futures) >= workers * 2:
+                    break
+            if not futures:
+                break
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk = futures.pop(future)
+                if future.exception() is not None:
+                    # not written, so the next run retries these ids
+                    stats["failed"] += len(chunk)
+                    print(f"Chunk of {len(chunk)} failed: {future.exception()}", file=sys.stderr)
+                else:
+                    record(future.result())
+    except BaseException:
+        # don't wait for the chunks still running: their rows won't be
+        # written, and the caller should write what it has right away
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+
+
+def _stop(signum, frame):
+    # systemd / Kubernetes stop: wind down as on Ctrl-C, writing out
+    # every row verified so far
+    raise KeyboardInterrupt
+
+
+def summary(stats):
+    seconds = stats["seconds"]
+    rate = stats["verified"] / seconds if seconds else 0.0
+    lines = [
+        f"{'Interrupted after' if stats['interrupted'] else 'Verified'} {stats['verified']} article(s) "
+        f"in {seconds:.1f}s ({rate:.2f}/s)",
+        f"  read {stats['read']}, skipped {stats['skipped']} already done, "
+        f"{stats['errors']} error(s), {stats['partial']} partial (no verdict), "
+        f"{stats['failed']} failed and left for the next run",
+    ]
+    for key in sorted(k for k in stats if k.startswith("verdict: ")):
+        lines.append(f"  {key[len('verdict: '):]}: {stats[key]}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m fakeguard", description="FakeGuard batch verification")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    verify = sub.add_parser("verify", help="verify every article of a JSON-lines file")
+    verify.add_argument("input", help='JSON-lines file, or "-" for stdin')
+    verify.add_argument("-o", "--output", required=True,
+                        help="a .parquet directory of part files, or a JSON-lines file to append to")
+    verify.add_argument("-w", "--workers", type=int, default=BATCH_WORKERS,
+                        help="worker processes, each with its own model (0: run in this process)")
+    verify.add_argument("-b", "--batch-size", type=int, default=BULK_CHUNK_SIZE, help="articles per model batch")
+    verify.add_argument("--mode", choices=sorted(MODES), default="relax")
+    verify.add_argument("--no-translate", action="store_true")
+    verify.add_argument("--wiki", action="store_true", help="also look the articles up on Wikipedia")
+    verify.add_argument("--flush-rows", type=int, default=BATCH_FLUSH_ROWS, help="rows per Parquet part file")
+    verify.add_argument("--stub", action="store_true", help="offline backends: no model, no network")
+
+    args = parser.parse_args(argv)
+    signal.signal(signal.SIGTERM, _stop)
+    if args.stub:
+        # inherited by the worker processes
+        os.environ["FAKEGUARD_BACKENDS"] = "stub"
+
+    stats = run(args.input, args.output, args.workers, args.batch_size, MODES[args.mode],
+                not args.no_translate, args.wiki, args.flush_rows)
+    print(summary(stats), file=sys.stderr)
+    if stats["interrupted"]:
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import io
+import json
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from config import BULK_CHUNK_SIZE, BULK_CHUNK_DEADLINE
+from services.pipeline import verify_batch
+
+TEXT_COLUMNS = ("text", "content", "body", "article")
+URL_COLUMNS = ("url", "link")
+
+RESULT_COLUMNS = [
+    "id", "input", "domain", "detected_lang", "model_result", "confidence", "real_prob",
+    "fake_prob", "mode_result", "related_count", "top_source", "verdict", "credibility",
+    "clickbait_level", "clickbait_score", "error", "degraded",
+]
+
+
+def read_bulk_input(data, filename):
+    """
+    Rows to verify from an uploaded CSV or JSON-lines file, as a DataFrame
+    with id, text and url columns. Each row needs a text or a URL.
+    """
+    if filename.lower().endswith((".jsonl", ".ndjson")):
+        records = [json.loads(line) for line in io.TextIOWrapper(io.BytesIO(data), encoding="utf-8") if line.strip()]
+        df = pd.DataFrame(records)
+    else:
+        df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+
+    text_column = next((c for c in TEXT_COLUMNS if c in df.columns), None)
+    url_column = next((c for c in URL_COLUMNS if c in df.columns), None)
+    if text_column is None and url_column is None:
+        raise ValueError(f"Expected a column named one of {TEXT_COLUMNS + URL_COLUMNS}")
+
+    rows = pd.DataFrame({
+        "id": df["id"].astype(str) if "id" in df.columns else [str(i + 1) for i in range(len(df))],
+        "text": df[text_column].fillna("").astype(str) if text_column else "",
+        "url": df[url_column].fillna("").astype(str).str.strip() if url_column else "",
+    })
+    return rows[(rows["text"].str.strip() != "") | (rows["url"] != "")].reset_index(drop=True)
+
+
+FLOAT_COLUMNS = ["confidence", "real_prob", "fake_prob", "credibility"]
+INT_COLUMNS = ["related_count", "clickbait_score"]
+
+
+def _input(item):
+    return item["url"] or " ".join(item["text"].split()[:12])
+
+
+def error_row(item, error):
+    row = dict.fromkeys(RESULT_COLUMNS, "")
+    row.update(dict.fromkeys(FLOAT_COLUMNS, None))
+    row.update(dict.fromkeys(INT_COLUMNS, 0))
+    row.update(id=item["id"], input=_input(item), error=error)
+    return row
+
+
+def result_row(item, analysis):
+    """
+    One output row (RESULT_COLUMNS) for an item and its
+    services.pipeline analysis.
+    """
+    if "error" in analysis:
+        return error_row(item, analysis["error"])
+    degraded = analysis["degraded"]
+    related = analysis["related"]
+    return {
+        "id": item["id"],
+        "input": _input(item),
+        "domain": analysis["domain"] if item["url"] else "",
+        "detected_lang": analysis["detected_lang"],
+        "model_result": analysis["result"],
+        "confidence": round(analysis["confidence"], 4),
+        "real_prob": round(analysis["real_prob"], 4),
+        "fake_prob": round(analysis["fake_prob"], 4),
+        "mode_result": analysis["adjusted_label"],
+        "related_count": len(related),
+        "top_source": related[0]["link"] if related else "",
+        # no verdict from partial evidence: missing sources would read as "no sources"
+        "verdict": "" if degraded else analysis["verdict"],
+        "credibility": None if degraded else analysis["cred_score"],
+        "clickbait_level": analysis["cb_level"],
+        "clickbait_score": int(analysis["cb_score"]),
+        "error": "partial result: some checks were unavailable" if degraded else "",
+        "degraded": ", ".join(f"{dependency} ({reason})" for dependency, reason in degraded),
+    }
+
+
+def verify_rows(items, mode, enable_translate=True, enable_wiki=False):
+    """
+    Output rows for {"id", "text", "url"} items, verified together with
+    services.pipeline.verify_batch.
+    """
+    analyses = verify_batch(items, mode, enable_translate, enable_wiki, budget=BULK_CHUNK_DEADLINE)
+    return [result_row(item, analysis) for item, analysis in zip(items, analyses)]
+
+
+class BulkJob:
+    """
+    Verifies a table of texts/URLs on a background thread, chunk by chunk,
+    so results can be shown while the rest is still running.
+
+    Each chunk goes through services.pipeline.verify_batch, the same path
+    as the API and the command-line runner.
+    """
+
+    def __init__(self, rows, mode, enable_translate=True, chunk_size=BULK_CHUNK_SIZE):
+        self.id = uuid.uuid4().hex[:12]
+        self.rows = rows
+        self.mode = mode
+        self.enable_translate = enable_translate
+        self.chunk_size = chunk_size
+        self.total = len(rows)
+        self.status = "pending"
+        self.error = None
+        self.started = None
+        self.finished = None
+        self._results = []
+        self._version = 0
+        self._table = None
+        self._csv = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"bulk-{self.id}", daemon=True)
+
+    def start(self):
+        self.status = "running"
+        self.started = time.time()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def done(self):
+        return len(self._results)
+
+    @property
+    def running(self):
+        return self.status == "running"
+
+    def results(self):
+        """
+        Rows verified so far; rebuilt only after a new chunk lands.
+        """
+        with self._lock:
+            if self._table is None or self._table[0] != self._version:
+                self._table = (self._version, pd.DataFrame(list(self._results), columns=RESULT_COLUMNS))
+            return self._table[1]
+
+    def csv_bytes(self):
+        table = self.results()
+        with self._lock:
+            if self._csv is None or self._csv[0] != self._version:
+                self._csv = (self._version, table.to_csv(index=False).encode("utf-8"))
+            return self._csv[1]
+
+    def _run(self):
+        try:
+            for start in range(0, self.total, self.chunk_size):
+                if self._cancel.is_set():
+                    self.status = "cancelled"
+                    return
+                chunk = self.rows.iloc[start:start + self.chunk_size]
+                rows = self._verify_chunk(chunk)
+                with self._lock:
+                    self._results.extend(rows)
+                    self._version += 1
+            self.status = "done"
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+        finally:
+            self.finished = time.time()
+
+    def _verify_chunk(self, chunk):
+        return verify_rows(chunk.to_dict("records"), self.mode, self.enable_translate)
+
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def submit(rows, mode, enable_translate=True):
+    """
+    Start a job and register it, so a later rerun or page reload can find
+    it again by id.
+    """
+    job = BulkJob(rows, mode, enable_translate)
+    with _jobs_lock:
+        _jobs[job.id] = job
+        # forget finished jobs beyond the most recent ones
+        finished = [j for j in _jobs.values() if not j.running and j is not job]
+        for old in sorted(finished, key=lambda j: j.started or 0)[:-10]:
+            del _jobs[old.id]
+    return job.start()
+
+
+def get_job(job_id):
+    with _jobs_lock:
+        return _jobs.get(job_id)
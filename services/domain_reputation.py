@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+from config import DOMAIN_REPUTATION_FILE
+
+STATUSES = ("trusted", "suspicious", "unknown")
+
+# How often (seconds) lookups check whether the file changed
+RELOAD_CHECK_SECONDS = 2.0
+
+Reputation = namedtuple("Reputation", ["domain", "status", "tags"])
+
+
+def host_of(url):
+    """
+    Lower-cased host of a URL or bare domain, without "www.", port or
+    trailing dot. Returns "" when there is none.
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = "//" + url
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+    host = host.rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+class DomainTrie:
+    """
+    Reversed-label suffix trie: "news.bbc.co.uk" is stored along
+    uk -> co -> bbc -> news, so a lookup walks one node per label of the
+    host and returns the most specific entry on the way. Unlike substring
+    matching, "bbc.com" matches "www.bbc.com" but not "notbbc.com" or
+    "bbc.com.evil.xyz".
+    """
+
+    def __init__(self):
+        self.root = {}
+        self.entries = []
+
+    def add(self, reputation):
+        node = self.root
+        for label in reversed(reputation.domain.split(".")):
+            node = node.setdefault(label, {})
+        # "" can't be a label, so it marks the entry stored at this node
+        node[""] = reputation
+        self.entries.append(reputation)
+
+    def lookup(self, host):
+        node, found = self.root, None
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get("", found)
+        return found
+
+
+def load_trie(path):
+    trie = DomainTrie()
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith(";"):
+                continue
+            parts = line.split()
+            if len(parts) < 2 or parts[1] not in STATUSES:
+                raise ValueError(f"{path}:{number}: expected '<domain> trusted|suspicious|unknown [tags]'")
+            tags = frozenset(parts[2].split(",")) if len(parts) > 2 else frozenset()
+            trie.add(Reputation(host_of(parts[0]), parts[1], tags))
+    return trie
+
+
+class ReputationRegistry:
+    """
+    Domain reputations from a file, reloaded when the file changes.
+    A broken edit keeps the previous list in service.
+    """
+
+    def __init__(self, path=DOMAIN_REPUTATION_FILE):
+        self.path = path
+        self._trie = DomainTrie()
+        self._stamp = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._refresh(force=True)
+
+    def _refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked < RELOAD_CHECK_SECONDS:
+            return
+        with self._lock:
+            self._checked = now
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp == self._stamp:
+                return
+            try:
+                trie = load_trie(self.path)
+            except (OSError, ValueError) as e:
+                print(f"Keeping previous domain reputations: {e}")
+                return
+            self._trie, self._stamp = trie, stamp
+
+    def lookup(self, url):
+        """
+        Reputation of the most specific listed domain covering url's host, or None.
+        """
+        self._refresh()
+        host = host_of(url)
+        return self._trie.lookup(host) if host else None
+
+    def status(self, url):
+        """
+        "trusted", "suspicious" or "unknown".
+        """
+        reputation = self.lookup(url)
+        return reputation.status if reputation else "unknown"
+
+    def domains(self, status=None, tag=None):
+        """
+        Listed domains, optionally only those with `status` and/or `tag`.
+        """
+        self._refresh()
+        return [
+            r.domain for r in self._trie.entries
+            if (status is None or r.status == status) and (tag is None or tag in r.tags)
+        ]
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ReputationRegistry()
+        return _registry
@@ -1,17 +1,40 @@
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+from config import CLICKBAIT_LEXICON
+from utils.phrase_matcher import PhraseMatcher
+
 CLICKBAIT_WORDS = [
     "shocking", "breaking", "unbelievable", "miracle", "secret", "exposed", "truth",
     "you won’t believe", "you wont believe", "must see", "viral", "insane",
     "cure", "instant", "guaranteed", "doctors hate", "trick"
 ]
 
-def clickbait_score(text: str):
-    text_low = text.lower()
-    hits = []
+def load_clickbait_phrases(path=CLICKBAIT_LEXICON):
+    phrases = list(CLICKBAIT_WORDS)
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            phrases += [line.strip() for line in f if line.strip() and not line.startswith(";")]
+    return phrases
+
+
+@lru_cache(maxsize=None)
+def get_clickbait_matcher():
+    # Built once per process; scanning costs the same for 20 phrases or 20,000
+    return PhraseMatcher(load_clickbait_phrases())
+
 
-    for w in CLICKBAIT_WORDS:
-        if w in text_low:
-            hits.append(w)
+def clickbait_matches(text: str):
+    """
+    Whole-word clickbait phrases in text as (start, end, phrase), longest
+    match wins where phrases overlap.
+    """
+    return get_clickbait_matcher().find(text, overlapping=False)
 
+
+def _score(hits):
     score = min(100, len(hits) * 15)
 
     level = "Low"
@@ -19,33 +42,67 @@ def clickbait_score(text: str):
         level = "High"
     elif score >= 30:
         level = "Medium"
+    return score, level
+
+
+def clickbait_score(text: str):
+    hits = {phrase for _, _, phrase in clickbait_matches(text)}
+    score, level = _score(hits)
+    return score, level, sorted(hits)
+
+
+def clickbait_score_batch(texts):
+    """
+    clickbait_score for a Series (or any iterable) of texts, as a DataFrame
+    with cb_score, cb_level, cb_words and cb_hits (total occurrences).
+    """
+    index = texts.index if isinstance(texts, pd.Series) else None
+    rows = []
+    for text in texts:
+        matches = clickbait_matches(text if isinstance(text, str) else "")
+        hits = {phrase for _, _, phrase in matches}
+        score, level = _score(hits)
+        rows.append((score, level, sorted(hits), len(matches)))
+    return pd.DataFrame(rows, columns=["cb_score", "cb_level", "cb_words", "cb_hits"], index=index)
+
 
-    return score, level, list(set(hits))
+# Reason codes used by explain_prediction and services.batch_scoring
+REASONS = {
+    "model_fake": "Model confidence leans towards FAKE based on text patterns.",
+    "model_real": "Model confidence leans towards REAL based on text patterns.",
+    "sources_multiple": "Multiple related sources found → supports REAL / verified information.",
+    "sources_none": "No related sources found → could be unverified or suspicious.",
+    "domain_trusted": "Domain is trusted → increases credibility.",
+    "domain_unknown": "Domain is unknown → credibility not confirmed.",
+    "clickbait_high": "High clickbait language detected → common in fake/misleading news.",
+    "clickbait_medium": "Some clickbait signals detected.",
+    "clickbait_low": "Low clickbait language → more natural news writing style.",
+}
 
 
 def explain_prediction(real_prob, fake_prob, related_count, domain_status, clickbait_level):
-    reasons = []
+    codes = []
 
     if fake_prob > real_prob:
-        reasons.append("Model confidence leans towards FAKE based on text patterns.")
+        codes.append("model_fake")
     else:
-        reasons.append("Model confidence leans towards REAL based on text patterns.")
+        codes.append("model_real")
 
     if related_count >= 2:
-        reasons.append("Multiple related sources found → supports REAL / verified information.")
+        codes.append("sources_multiple")
     elif related_count == 0:
-        reasons.append("No related sources found → could be unverified or suspicious.")
+        codes.append("sources_none")
 
     if domain_status == "trusted":
-        reasons.append("Domain is trusted → increases credibility.")
+        codes.append("domain_trusted")
     else:
-        reasons.append("Domain is unknown → credibility not confirmed.")
+        codes.append("domain_unknown")
 
     if clickbait_level == "High":
-        reasons.append("High clickbait language detected → common in fake/misleading news.")
+        codes.append("clickbait_high")
     elif clickbait_level == "Medium":
-        reasons.append("Some clickbait signals detected.")
+        codes.append("clickbait_medium")
     else:
-        reasons.append("Low clickbait language → more natural news writing style.")
+        codes.append("clickbait_low")
 
-    return reasons
+    return [REASONS[code] for code in codes]
@@ -0,0 +1,263 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+import pyarrow as pa
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process compaction lock
+    fcntl = None
+
+from config import FEATURE_STORE_DIR, FEATURE_STORE_MAX_SEGMENTS
+
+SLOTS = range(1, 4)
+
+# Enriched fields kept per article (the outputs of processing.process_record)
+SCHEMA = pa.schema(
+    [
+        ("content_hash", pa.string()),
+        ("pipeline_version", pa.string()),
+        ("created_at", pa.float64()),
+        ("clean_text", pa.string()),
+        ("clean_title", pa.string()),
+        ("clean_text_keyword_list", pa.list_(pa.string())),
+    ]
+    + [(f"scraped_news_{i}_{part}", pa.string()) for i in SLOTS for part in ("title", "url", "content")]
+    + [(f"keywords_{i}", pa.list_(pa.string())) for i in SLOTS]
+    + [(f"similarity_score{i}", pa.float64()) for i in SLOTS]
+    + [
+        ("dynamic_weighted_mean_similarity", pa.float64()),
+        ("lexical_diversity_rate", pa.float64()),
+        ("spell_score", pa.float64()),
+        ("sentiment_score", pa.float64()),
+        ("fake_bert_prediction", pa.int64()),
+    ]
+)
+
+META_FIELDS = ("content_hash", "pipeline_version", "created_at")
+
+
+def content_hash(title, text, date=None):
+    payload = json.dumps([title or "", text or "", "" if date is None else str(date)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _row(key, version, record):
+    row = {"content_hash": key, "pipeline_version": version, "created_at": time.time()}
+    for field in SCHEMA:
+        if field.name in META_FIELDS:
+            continue
+        value = record.get(field.name)
+        if pa.types.is_list(field.type):
+            # empty keyword slots come back from the pipeline as {}
+            value = [str(v) for v in value] if value else []
+        elif value is not None and pa.types.is_floating(field.type):
+            value = float(value)
+        elif value is not None and pa.types.is_integer(field.type):
+            value = int(value)
+        row[field.name] = value
+    return row
+
+
+class FeatureStore:
+    """
+    Append-only store of enriched pipeline outputs, keyed by content hash.
+
+    Each pipeline version lives in its own directory of Arrow IPC segments.
+    Segments are memory-mapped on read; compact() merges them into one, and
+    runs by itself once a version has more than `max_segments`.
+    """
+
+    def __init__(self, root=FEATURE_STORE_DIR, version="1", max_segments=FEATURE_STORE_MAX_SEGMENTS):
+        self.root = root
+        self.version = str(version)
+        self.max_segments = max_segments
+        self._index = {}
+        self._segments = {}
+        self._seen = set()
+
+    def _version_dir(self, version=None):
+        return os.path.join(self.root, f"v{version or self.version}")
+
+    def _segment_paths(self, version=None):
+        path = self._version_dir(version)
+        if not os.path.isdir(path):
+            return []
+        return sorted(
+            os.path.join(path, name) for name in os.listdir(path) if name.endswith(".arrow")
+        )
+
+    def _open(self, path):
+        table = self._segments.get(path)
+        if table is None:
+            table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+            self._segments[path] = table
+        return table
+
+    def _refresh(self):
+        # Pick up segments written by other processes since the last lookup
+        for path in self._segment_paths():
+            if path in self._seen:
+                continue
+            keys = self._open(path).column("content_hash").to_pylist()
+            for row, key in enumerate(keys):
+                self._index[key] = (path, row)
+            self._seen.add(path)
+
+    def get(self, key):
+        location = self._index.get(key)
+        if location is None:
+            self._refresh()
+            location = self._index.get(key)
+        if location is None:
+            return None
+        path, row = location
+        try:
+            return self._open(path).slice(row, 1).to_pylist()[0]
+        except OSError:
+            # segment was compacted away by another process
+            self.reset()
+            self._refresh()
+            if key not in self._index:
+                return None
+            path, row = self._index[key]
+            return self._open(path).slice(row, 1).to_pylist()[0]
+
+    def get_many(self, keys):
+        return {key: self.get(key) for key in keys}
+
+    def put(self, key, record):
+        self.put_many([(key, record)])
+
+    def put_many(self, items):
+        rows = [_row(key, self.version, record) for key, record in items]
+        if not rows:
+            return None
+        path = self._write(pa.Table.from_pylist(rows, schema=SCHEMA))
+        for row, item in enumerate(rows):
+            self._index[item["content_hash"]] = (path, row)
+        self._seen.add(path)
+        if self.max_segments and len(self._segment_paths()) > self.max_segments:
+            # another process already compacting is good enough
+            self.compact(wait=False)
+        return path
+
+    def _write(self, table, version=None, stamp=None):
+        directory = self._version_dir(version)
+        os.makedirs(directory, exist_ok=True)
+        name = f"seg-{stamp or f'{time.time_ns():020d}'}-{uuid.uuid4().hex[:8]}.arrow"
+        path = os.path.join(directory, name)
+        tmp = path + ".tmp"
+        with pa.OSFile(tmp, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+        return path
+
+    def read_table(self, version=None):
+        """
+        All rows of a pipeline version as one Arrow table, latest write per key.
+        """
+        paths = self._segment_paths(version)
+        if not paths:
+            return SCHEMA.empty_table()
+        table = pa.concat_tables(pa.ipc.open_file(pa.memory_map(p, "r")).read_all() for p in paths)
+        return _latest_per_key(table)
+
+    def compact(self, version=None, wait=True):
+        """
+        Merge a version's segments into one. Returns the number merged, or
+        0 without waiting when `wait` is false and another process holds
+        the compaction lock.
+        """
+        version = str(version or self.version)
+        directory = self._version_dir(version)
+        if not os.path.isdir(directory):
+            return 0
+        with open(os.path.join(directory, ".compact.lock"), "a") as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return 0
+            paths = self._segment_paths(version)
+            if len(paths) <= 1:
+                return len(paths)
+            merged = self.read_table(version)
+            # Keep the stamp of the newest merged segment so anything written
+            # while compacting still sorts (and wins) after the merged rows
+            stamp = os.path.basename(paths[-1]).split("-")[1]
+            self._write(merged, version, stamp=stamp)
+            for path in paths:
+                os.remove(path)
+        self.reset()
+        return len(paths)
+
+    def invalidate(self, version):
+        path = self._version_dir(version)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        if str(version) == self.version:
+            self.reset()
+
+    def versions(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name[1:] for name in os.listdir(self.root) if name.startswith("v"))
+
+    def reset(self):
+        self._index.clear()
+        self._segments.clear()
+        self._seen.clear()
+
+
+def _latest_per_key(table):
+    if table.num_rows == 0:
+        return table
+    # Segments are concatenated oldest first, so the last occurrence wins
+    keys = table.column("content_hash").to_pylist()
+    last = {key: row for row, key in enumerate(keys)}
+    keep = sorted(last.values())
+    if len(keep) == table.num_rows:
+        return table
+    return table.take(pa.array(keep))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the enriched-feature store")
+    parser.add_argument("--root", default=FEATURE_STORE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    compact = sub.add_parser("compact", help="merge the segments of a pipeline version")
+    compact.add_argument("--version", action="append", help="version to compact (default: all)")
+
+    invalidate = sub.add_parser("invalidate", help="drop every entry of a pipeline version")
+    invalidate.add_argument("version", nargs="+")
+
+    sub.add_parser("stats", help="show rows and segments per version")
+
+    args = parser.parse_args()
+    store = FeatureStore(args.root)
+
+    if args.command == "compact":
+        for version in args.version or store.versions():
+            merged = store.compact(version)
+            print(f"v{version}: compacted {merged} segment(s)")
+    elif args.command == "invalidate":
+        for version in args.version:
+            store.invalidate(version)
+            print(f"v{version}: removed")
+    else:
+        for version in store.versions():
+            segments = store._segment_paths(version)
+            rows = store.read_table(version).num_rows
+            print(f"v{version}: {rows} row(s) in {len(segments)} segment(s)")
+
+
+if __name__ == "__main__":
+    main()
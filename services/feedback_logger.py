@@ -1,20 +1,191 @@
+import argparse
+import atexit
 import csv
 import os
+import queue
+import sqlite3
+import threading
 from datetime import datetime
 
+from config import FEEDBACK_DB
+
+COLUMNS = ["time", "text", "final_verdict", "user_feedback"]
+
+# The writer waits this long for more rows before committing a batch
+FLUSH_SECONDS = 0.5
+MAX_BATCH = 500
+
+
+def _connect(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS feedback ("
+        "id INTEGER PRIMARY KEY, time TEXT, text TEXT, final_verdict TEXT, user_feedback TEXT)"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS imported (path TEXT PRIMARY KEY)")
+    return conn
+
+
+class FeedbackSink:
+    """
+    Feedback rows queued in memory and written to SQLite by one background
+    thread in batched transactions, so a click never waits on disk and
+    concurrent workers can't interleave or duplicate rows.
+
+    Pending rows are flushed at interpreter exit.
+    """
+
+    def __init__(self, path=FEEDBACK_DB):
+        self.path = path
+        self._queue = queue.Queue()
+        self._imported = set()
+        _connect(path).close()
+        self._thread = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def add(self, row):
+        self._queue.put(row)
+
+    def flush(self):
+        """
+        Block until every queued row has been committed.
+        """
+        self._queue.join()
+
+    def _run(self):
+        conn = _connect(self.path)
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < MAX_BATCH:
+                    batch.append(self._queue.get(timeout=FLUSH_SECONDS))
+            except queue.Empty:
+                pass
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO feedback (time, text, final_verdict, user_feedback) VALUES (?, ?, ?, ?)",
+                        batch,
+                    )
+            except sqlite3.Error as e:
+                print(f"Could not save {len(batch)} feedback row(s): {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def import_csv(self, csv_path):
+        """
+        Copy rows from a legacy feedback CSV, once per file. Returns the
+        number of rows imported.
+        """
+        key = os.path.abspath(csv_path)
+        if key in self._imported:
+            return 0
+        conn = _connect(self.path)
+        try:
+            with conn:
+                # claiming the path first takes the write lock, so two
+                # workers can't both import the same file
+                conn.execute("INSERT INTO imported VALUES (?)", (key,))
+                with open(csv_path, newline="", encoding="utf-8") as f:
+                    rows = [
+                        tuple(row.get(column, "") for column in COLUMNS)
+                        for row in csv.DictReader(f)
+                    ]
+                conn.executemany(
+                    "INSERT INTO feedback (time, text, final_verdict, user_feedback) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+            return len(rows)
+        except sqlite3.IntegrityError:
+            return 0
+        finally:
+            self._imported.add(key)
+            conn.close()
+
+    def export(self, out_path, since=None):
+        """
+        Write every row (or those from `since`, "YYYY-MM-DD ...") to a CSV
+        with the legacy columns, for retraining. Returns the row count.
+        """
+        self.flush()
+        conn = _connect(self.path)
+        try:
+            sql = "SELECT time, text, final_verdict, user_feedback FROM feedback"
+            params = ()
+            if since:
+                sql += " WHERE time >= ?"
+                params = (since,)
+            count = 0
+            with open(out_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(COLUMNS)
+                for row in conn.execute(sql + " ORDER BY id", params):
+                    writer.writerow(row)
+                    count += 1
+            return count
+        finally:
+            conn.close()
+
+
+_sink = None
+_sink_lock = threading.Lock()
+
+
+def get_sink():
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = FeedbackSink()
+        return _sink
+
+
+def import_legacy(feedback_file):
+    """
+    Import a legacy feedback CSV if there is one (once per file). Call at
+    startup, not per click. Returns the number of rows imported.
+    """
+    if not os.path.exists(feedback_file):
+        return 0
+    return get_sink().import_csv(feedback_file)
+
+
 def save_feedback(feedback_file, text, verdict, user_feedback):
-    file_exists = os.path.exists(feedback_file)
+    """
+    Queue one feedback row. `feedback_file` is the legacy CSV, which
+    import_legacy() folds into the feedback database.
+    """
+    get_sink().add((
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        text[:300],  # limit long text
+        verdict,
+        user_feedback,
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feedback store")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="write feedback to a CSV for retraining")
+    export.add_argument("out")
+    export.add_argument("--since", help="only rows from this date (YYYY-MM-DD)")
+
+    migrate = sub.add_parser("import", help="import a legacy feedback CSV")
+    migrate.add_argument("csv")
 
-    with open(feedback_file, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
+    args = parser.parse_args()
+    sink = get_sink()
+    if args.command == "export":
+        print(f"Exported {sink.export(args.out, args.since)} row(s) to {args.out}")
+    else:
+        print(f"Imported {sink.import_csv(args.csv)} row(s) from {args.csv}")
 
-        # Write header only first time
-        if not file_exists:
-            writer.writerow(["time", "text", "final_verdict", "user_feedback"])
 
-        writer.writerow([
-            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            text[:300],  # limit long text
-            verdict,
-            user_feedback
-        ])
+if __name__ == "__main__":
+    main()
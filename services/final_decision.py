@@ -22,3 +22,29 @@ def final_verdict(model_result, confidence, related_articles_count, domain_statu
 
     # ⚠️ Otherwise uncertain
     return "UNCERTAIN"
+
+
+def combined_verdict(model_result, confidence, related_count, domain_status, original_text):
+    """
+    Verdict shown in the app: sources first, then domain, then the model.
+    """
+    HIGH = 0.80
+    MID = 0.60
+    if len(original_text.split()) < 25 and "recommend" in original_text.lower():
+        return "REAL ✅ (General Fact Statement)"
+    if related_count >= 2:
+        return "REAL ✅ (Sources Verified)"
+    if domain_status == "trusted" and model_result == "Real News" and confidence >= MID:
+        return "REAL ✅ (Trusted Domain)"
+    if model_result == "Fake News" and confidence >= HIGH and related_count == 0:
+        return "FAKE ❌ (No Sources Found)"
+    return "UNCERTAIN ⚠️ (Needs Manual Check)"
+
+
+def strict_relax_decision(real_prob, fake_prob, mode):
+    diff = abs(real_prob - fake_prob)
+    if mode == "Strict 🔥" and diff < 0.15:
+        return "Uncertain", max(real_prob, fake_prob)
+    if fake_prob > real_prob:
+        return "Fake News", fake_prob
+    return "Real News", real_prob
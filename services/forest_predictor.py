@@ -0,0 +1,162 @@
+import pickle
+
+import numpy as np
+
+
+class CompiledForest:
+    """
+    Flattened, vectorized copy of a fitted sklearn RandomForestClassifier.
+
+    All trees are packed into contiguous node arrays once, then batches are
+    scored by walking every (row, tree) pair one level per step. Predictions
+    match RandomForestClassifier.predict / predict_proba bit for bit.
+    """
+
+    def __init__(self, left, right, feature, threshold, missing_left, proba,
+                 roots, max_depth, classes, feature_names=None):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.missing_left = missing_left
+        self.proba = proba
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes = classes
+        self.feature_names = feature_names
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output forests can be compiled")
+
+        left, right, feature, threshold, missing_left, proba, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            nodes = tree.__getstate__()["nodes"]
+            n = tree.node_count
+
+            is_leaf = tree.children_left == -1
+            # Leaves point at themselves so finished rows stay put while the
+            # deeper trees keep walking
+            own = np.arange(n) + offset
+            left.append(np.where(is_leaf, own, tree.children_left + offset))
+            right.append(np.where(is_leaf, own, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+
+            # Trees fitted before missing-value support send NaN to the right
+            if "missing_go_to_left" in nodes.dtype.names:
+                missing_left.append(nodes["missing_go_to_left"].astype(bool))
+            else:
+                missing_left.append(np.zeros(n, dtype=bool))
+
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :].astype(np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            proba.append(value / normalizer)
+
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            left=np.concatenate(left).astype(np.intp),
+            right=np.concatenate(right).astype(np.intp),
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            missing_left=np.concatenate(missing_left),
+            proba=np.concatenate(proba),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            classes=np.asarray(forest.classes_),
+            feature_names=getattr(forest, "feature_names_in_", None),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=True) as data:
+            feature_names = data["feature_names"]
+            return cls(
+                left=data["left"],
+                right=data["right"],
+                feature=data["feature"],
+                threshold=data["threshold"],
+                missing_left=data["missing_left"],
+                proba=data["proba"],
+                roots=data["roots"],
+                max_depth=data["max_depth"],
+                classes=data["classes"],
+                feature_names=feature_names if feature_names.size else None,
+            )
+
+    def save(self, path):
+        np.savez(
+            path,
+            left=self.left,
+            right=self.right,
+            feature=self.feature,
+            threshold=self.threshold,
+            missing_left=self.missing_left,
+            proba=self.proba,
+            roots=self.roots,
+            max_depth=self.max_depth,
+            classes=self.classes,
+            feature_names=np.asarray(self.feature_names if self.feature_names is not None else [], dtype=object),
+        )
+
+    def _as_matrix(self, X):
+        if hasattr(X, "columns") and self.feature_names is not None:
+            X = X[list(self.feature_names)]
+        # sklearn scores trees on float32 inputs
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return X
+
+    def apply(self, X):
+        """
+        Leaf index (into the flattened node arrays) for every row and tree.
+        """
+        X = self._as_matrix(X)
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.roots.size)).copy()
+
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[nodes]]
+            go_left = np.where(np.isnan(values), self.missing_left[nodes], values <= self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return nodes
+
+    def predict_proba(self, X, chunk_size=65536):
+        X = self._as_matrix(X)
+        out = np.empty((X.shape[0], self.classes.size), dtype=np.float64)
+
+        for start in range(0, X.shape[0], chunk_size):
+            leaves = self.apply(X[start:start + chunk_size])
+            # Accumulate tree by tree, in estimator order, like
+            # RandomForestClassifier.predict_proba does
+            all_proba = np.zeros((leaves.shape[0], self.classes.size), dtype=np.float64)
+            for t in range(leaves.shape[1]):
+                all_proba += self.proba[leaves[:, t]]
+            all_proba /= self.roots.size
+            out[start:start + chunk_size] = all_proba
+
+        return out
+
+    def predict(self, X, chunk_size=65536):
+        proba = self.predict_proba(X, chunk_size=chunk_size)
+        return self.classes.take(np.argmax(proba, axis=1), axis=0)
+
+
+def load_forest(path="model/random_forest_model.pkl"):
+    """
+    Unpickle a fitted random forest and compile it.
+    """
+    with open(path, "rb") as file:
+        return CompiledForest.from_sklearn(pickle.load(file))
@@ -0,0 +1,80 @@
+import os
+import sqlite3
+import threading
+from collections import deque
+
+import pandas as pd
+
+COLUMNS = [
+    "time", "input_type", "domain", "model_result", "mode_result",
+    "confidence", "real_prob", "fake_prob", "final_verdict",
+]
+
+
+class HistoryStore:
+    """
+    The most recent `capacity` checks of a session, newest first.
+
+    The DataFrame and CSV export are only rebuilt after a new row arrives,
+    not on every rerun. With `db_path` every row is also appended to a
+    SQLite table shared by all sessions.
+    """
+
+    def __init__(self, capacity=200, db_path=None):
+        self._rows = deque(maxlen=capacity)
+        self._version = 0
+        self._table = None
+        self._csv = None
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        if db_path:
+            with self._connect() as conn:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS history ({', '.join(COLUMNS)})")
+
+    def _connect(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, row):
+        values = tuple(row.get(column) for column in COLUMNS)
+        with self._lock:
+            # appendleft keeps the newest first; the oldest row falls off the end
+            self._rows.appendleft(values)
+            self._version += 1
+        if self.db_path:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(f"INSERT INTO history VALUES ({', '.join('?' * len(COLUMNS))})", values)
+            finally:
+                conn.close()
+
+    def table(self):
+        with self._lock:
+            if self._table is None or self._table[0] != self._version:
+                self._table = (self._version, pd.DataFrame(list(self._rows), columns=COLUMNS))
+            return self._table[1]
+
+    def csv_bytes(self):
+        table = self.table()
+        with self._lock:
+            if self._csv is None or self._csv[0] != self._version:
+                self._csv = (self._version, table.to_csv(index=False).encode("utf-8"))
+            return self._csv[1]
+
+    def page(self, number, size=10):
+        """
+        Rows of 1-based page `number`, newest first.
+        """
+        start = (number - 1) * size
+        return self.table().iloc[start:start + size]
+
+    def pages(self, size=10):
+        return max(1, -(-len(self._rows) // size))
@@ -0,0 +1,168 @@
+import glob
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from config import LANGID_PROFILE_CACHE
+
+# Probability mass given to an n-gram a language's profile has never seen
+SMOOTHING = 1e-7
+
+# Stop reading once the best language leads the runner-up by this many
+# nats after at least MIN_NGRAMS n-grams
+CONFIDENT_MARGIN = 12.0
+MIN_NGRAMS = 48
+BLOCK = 64
+
+# Upper bound on how much of a long article is looked at
+MAX_CHARS = 3000
+
+NON_LETTERS = re.compile(r"[^\w]|[\d_]+")
+
+COMMON_ENGLISH = frozenset("""
+the of and to in is that for it was on are as with be by this have from at not
+but or an they which you has his their were been its will would there we more
+said can all one also about who after he she when than into what new had over
+""".split())
+
+
+def _langdetect_profiles():
+    import langdetect
+    return os.path.join(os.path.dirname(langdetect.__file__), "profiles")
+
+
+def build_profiles(profile_dir=None):
+    """
+    Compile character n-gram profiles (langdetect's bundled Wikipedia
+    profiles by default) into an n-gram -> per-language log-probability matrix.
+    """
+    profile_dir = profile_dir or _langdetect_profiles()
+    profiles = []
+    for path in sorted(glob.glob(os.path.join(profile_dir, "*"))):
+        with open(path, encoding="utf-8") as f:
+            profiles.append(json.load(f))
+
+    languages = [p["name"] for p in profiles]
+    ngrams = sorted({ng for p in profiles for ng in p["freq"]})
+    row = {ng: i for i, ng in enumerate(ngrams)}
+
+    probs = np.full((len(ngrams), len(languages)), SMOOTHING, dtype=np.float64)
+    for j, profile in enumerate(profiles):
+        n_words = profile["n_words"]
+        for ng, count in profile["freq"].items():
+            probs[row[ng], j] += count / n_words[len(ng) - 1]
+
+    return ngrams, languages, np.log(probs).astype(np.float32)
+
+
+class LanguageIdentifier:
+    """
+    Deterministic naive-Bayes language identification over character 1-3
+    grams. Unlike langdetect there is no random sampling, so the same text
+    always gets the same answer.
+    """
+
+    def __init__(self, ngrams, languages, log_probs):
+        self.languages = list(languages)
+        self.log_probs = log_probs
+        self.index = {ng: i for i, ng in enumerate(ngrams)}
+
+    @classmethod
+    def load(cls, cache_path=LANGID_PROFILE_CACHE):
+        """
+        Load the compiled profiles, compiling and caching them on first use.
+        """
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as data:
+                return cls(data["ngrams"].tolist(), data["languages"].tolist(), data["log_probs"])
+
+        ngrams, languages, log_probs = build_profiles()
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = cache_path + ".tmp.npz"
+        np.savez(tmp, ngrams=np.array(ngrams), languages=np.array(languages), log_probs=log_probs)
+        os.replace(tmp, cache_path)
+        return cls(ngrams, languages, log_probs)
+
+    def _rows(self, text):
+        rows = []
+        for word in NON_LETTERS.sub(" ", text[:MAX_CHARS]).split():
+            padded = f" {word} "
+            for n in (1, 2, 3):
+                for k in range(len(padded) - n + 1):
+                    ng = padded[k:k + n]
+                    if n == 1 and ng == " ":
+                        continue
+                    i = self.index.get(ng)
+                    if i is not None:
+                        rows.append(i)
+        return rows
+
+    def scores(self, text):
+        """
+        Summed log-probabilities per language, with early exit once one
+        language is clearly ahead. Returns None when nothing matched.
+        """
+        rows = self._rows(text)
+        if not rows:
+            return None
+
+        total = np.zeros(len(self.languages), dtype=np.float64)
+        for start in range(0, len(rows), BLOCK):
+            total += self.log_probs[rows[start:start + BLOCK]].sum(axis=0, dtype=np.float64)
+            if start + BLOCK >= MIN_NGRAMS:
+                top2 = np.partition(total, -2)[-2:]
+                if top2[1] - top2[0] >= CONFIDENT_MARGIN:
+                    break
+        return total
+
+    def detect(self, text):
+        if looks_english(text):
+            return "en"
+        total = self.scores(text)
+        if total is None:
+            return "unknown"
+        return self.languages[int(np.argmax(total))]
+
+    def detect_batch(self, texts):
+        return [self.detect(text) for text in texts]
+
+
+def looks_english(text, min_ratio=0.2, sample_words=60):
+    """
+    Cheap short-circuit for pure-ASCII text full of common English words.
+    """
+    if not text.isascii():
+        return False
+    words = text.lower().split()[:sample_words]
+    if len(words) < 5:
+        return False
+    hits = sum(1 for w in words if w.strip(".,;:!?\"'()") in COMMON_ENGLISH)
+    return hits / len(words) >= min_ratio
+
+
+_identifier = None
+_identifier_lock = threading.Lock()
+
+
+def get_identifier():
+    global _identifier
+    with _identifier_lock:
+        if _identifier is None:
+            _identifier = LanguageIdentifier.load()
+        return _identifier
+
+
+def detect(text):
+    """
+    ISO 639-1 code (langdetect naming, e.g. "zh-cn"), or "unknown".
+    """
+    return get_identifier().detect(text)
+
+
+def detect_batch(texts):
+    return get_identifier().detect_batch(texts)
@@ -0,0 +1,130 @@
+import re
+import threading
+import zlib
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from utils.text_cleaner import clean_text
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+Match = namedtuple("Match", ["key", "similarity", "payload"])
+
+
+def shingles(text, k=5):
+    """
+    32-bit hashes of the k-word shingles of the cleaned text.
+    Texts shorter than k words give a single shingle.
+    """
+    words = re.findall(r"\w+", clean_text(text))
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    grams = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+    return np.array([zlib.crc32(g.encode("utf-8")) for g in grams], dtype=np.uint64)
+
+
+class MinHasher:
+    """
+    MinHash signatures from `num_perm` universal hash functions
+    (a * x + b) mod p, seeded so every process gets the same permutations.
+    """
+
+    def __init__(self, num_perm=128, seed=1):
+        rng = np.random.RandomState(seed)
+        # a, b < 2**31 and x < 2**32 keep a * x + b inside uint64
+        self.a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self.b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+
+    def signature(self, hashes):
+        if len(hashes) == 0:
+            return None
+        permuted = (np.outer(hashes, self.a) + self.b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """
+    In-memory LSH index of MinHash signatures for finding syndicated and
+    lightly edited copies of documents that were already verified.
+
+    Signatures are split into `bands` bands; documents sharing any band
+    are candidates, and a candidate matches when its estimated Jaccard
+    similarity is at least `threshold`. At most `capacity` documents are
+    kept; the least recently added or matched one is evicted first.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=32, capacity=10000, shingle_size=5):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.capacity = capacity
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self._docs = OrderedDict()
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def signature(self, text):
+        return self.hasher.signature(shingles(text, self.shingle_size))
+
+    def _band_keys(self, signature):
+        return [(i, signature[i * self.rows:(i + 1) * self.rows].tobytes()) for i in range(self.bands)]
+
+    def _remove(self, key):
+        signature, _ = self._docs.pop(key)
+        for band in self._band_keys(signature):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def add(self, key, text, payload=None):
+        """
+        Index text under key; payload is handed back on a later match.
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return
+        with self._lock:
+            if key in self._docs:
+                self._remove(key)
+            self._docs[key] = (signature, payload)
+            for band in self._band_keys(signature):
+                self._buckets.setdefault(band, set()).add(key)
+            while len(self._docs) > self.capacity:
+                self._remove(next(iter(self._docs)))
+
+    def query(self, text, accept=None):
+        """
+        Best indexed document at or above the threshold as a Match, or
+        None. `accept(payload)` can rule out candidates, e.g. ones
+        computed with different settings.
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        with self._lock:
+            candidates = set()
+            for band in self._band_keys(signature):
+                candidates.update(self._buckets.get(band, ()))
+
+            best = None
+            for key in candidates:
+                stored, payload = self._docs[key]
+                similarity = float(np.mean(stored == signature))
+                if similarity < self.threshold or (accept is not None and not accept(payload)):
+                    continue
+                if best is None or similarity > best.similarity:
+                    best = Match(key, similarity, payload)
+
+            if best is not None:
+                self._docs.move_to_end(best.key)
+            return best
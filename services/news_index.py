@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from config import NEWS_INDEX_DB, NEWS_INDEX_MIN_COVERAGE
+from utils.fts import STOP_WORDS, match_query
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT UNIQUE NOT NULL,
+    title TEXT,
+    source TEXT,
+    published TEXT,
+    snippet TEXT,
+    added REAL
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles (published);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, snippet, content='articles', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, snippet) VALUES (new.id, new.title, new.snippet);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, snippet) VALUES ('delete', old.id, old.title, old.snippet);
+    INSERT INTO articles_fts (rowid, title, snippet) VALUES (new.id, new.title, new.snippet);
+END;
+"""
+
+SNIPPET_CHARS = 500
+
+
+def _terms(text):
+    return {w for w in re.findall(r"\w+", text.lower()) if len(w) >= 2 and w not in STOP_WORDS}
+
+
+def coverage(query_terms, text):
+    """
+    Share of query terms found in text (prefix match, so "elections"
+    still counts a hit on "election").
+    """
+    if not query_terms:
+        return 0.0
+    words = _terms(text)
+    found = sum(
+        1 for term in query_terms
+        if term in words or any(w.startswith(term[:5]) for w in words if len(term) > 5)
+    )
+    return found / len(query_terms)
+
+
+class NewsIndex:
+    """
+    Local full-text archive of news articles with BM25 ranking.
+
+    Articles are upserted by URL, so the archive can be fed incrementally
+    from search results and bulk imports.
+    """
+
+    def __init__(self, db_path=NEWS_INDEX_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def add_articles(self, articles):
+        """
+        articles: dicts with title, link (or url), source, date, snippet.
+        """
+        now = time.time()
+        rows = []
+        for article in articles:
+            url = article.get("link") or article.get("url")
+            if not url:
+                continue
+            rows.append((
+                url,
+                article.get("title") or "",
+                article.get("source") or "",
+                (article.get("date") or "")[:10],
+                (article.get("snippet") or article.get("body") or "")[:SNIPPET_CHARS],
+                now,
+            ))
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO articles (url, title, source, published, snippet, added) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET title = excluded.title, source = excluded.source, "
+                "published = excluded.published, snippet = excluded.snippet",
+                rows,
+            )
+        return len(rows)
+
+    def search(self, query, limit=5, since=None, until=None, min_coverage=NEWS_INDEX_MIN_COVERAGE):
+        """
+        Best BM25 matches, optionally limited to a published-date range
+        (inclusive "YYYY-MM-DD" strings). Hits that share less than
+        `min_coverage` of the query's terms are dropped, so a loose OR
+        match doesn't count as corroboration.
+        """
+        expression = match_query(query)
+        if not expression:
+            return []
+
+        sql = (
+            "SELECT a.title, a.url, a.source, a.published, a.snippet "
+            "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+            "WHERE articles_fts MATCH ?"
+        )
+        params = [expression]
+        if since:
+            sql += " AND a.published >= ?"
+            params.append(since)
+        if until:
+            sql += " AND a.published <= ?"
+            params.append(until)
+        sql += " ORDER BY bm25(articles_fts, 3.0, 1.0) LIMIT ?"
+        params.append(limit * 4)
+
+        query_terms = _terms(query)
+        results = []
+        for title, url, source, published, snippet in self._connect().execute(sql, params):
+            if coverage(query_terms, f"{title} {snippet}") < min_coverage:
+                continue
+            results.append({
+                "title": title,
+                "link": url,
+                "source": source,
+                "date": published,
+                "snippet": snippet,
+            })
+            if len(results) == limit:
+                break
+        return results
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_news_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = NewsIndex()
+        return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local news archive index")
+    parser.add_argument("--db", default=NEWS_INDEX_DB)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="add articles from JSON-lines files")
+    ingest.add_argument("files", nargs="+")
+
+    query = sub.add_parser("query", help="search the archive")
+    query.add_argument("text")
+    query.add_argument("--since")
+    query.add_argument("--until")
+    query.add_argument("--limit", type=int, default=5)
+
+    args = parser.parse_args()
+    index = NewsIndex(args.db)
+
+    if args.command == "ingest":
+        added = 0
+        for path in args.files:
+            batch = []
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        batch.append(json.loads(line))
+                    if len(batch) == 5000:
+                        added += index.add_articles(batch)
+                        batch = []
+            added += index.add_articles(batch)
+        print(f"Ingested {added} articles; archive holds {index.count()}")
+    else:
+        started = time.perf_counter()
+        hits = index.search(args.text, limit=args.limit, since=args.since, until=args.until)
+        for hit in hits:
+            print(f"{hit['date']}  {hit['source']}  {hit['title']}\n    {hit['link']}")
+        print(f"({len(hits)} hit(s), {(time.perf_counter() - started) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
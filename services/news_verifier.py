@@ -1,21 +1,46 @@
 from ddgs import DDGS
+from ddgs.exceptions import DDGSException, RatelimitException, TimeoutException
 
+from config import RELATED_ARTICLES_BACKEND
+from services.news_index import get_news_index
+from services.resilience import dependency_timeout, guarded_call
 
-def fetch_related_articles(query: str, max_results=5):
-    results = []
-
-    if not query or len(query.strip()) < 5:
-        return results
 
+def _search_news(query, max_results, timeout):
+    results = []
     try:
-        with DDGS() as ddgs:
+        with DDGS(timeout=timeout) as ddgs:
             for r in ddgs.news(query, max_results=max_results):
                 results.append({
                     "title": r.get("title", "No title"),
                     "link": r.get("url", ""),
-                    "source": r.get("source", "Unknown")
+                    "source": r.get("source", "Unknown"),
+                    "date": r.get("date", ""),
+                    "snippet": r.get("body", "")
                 })
-    except:
+    except (RatelimitException, TimeoutException):
+        raise
+    except DDGSException:
+        # "no results" for this query, not an outage
+        pass
+    return results
+
+
+def fetch_related_articles(query: str, max_results=5, deadline=None, backend=None, since=None):
+    if not query or len(query.strip()) < 5:
         return []
 
+    backend = backend or RELATED_ARTICLES_BACKEND
+    if backend in ("index", "index+ddgs"):
+        hits = get_news_index().search(query, limit=max_results, since=since)
+        if hits or backend == "index":
+            return hits
+
+    timeout = dependency_timeout("ddgs", deadline)
+    results = guarded_call("ddgs", _search_news, query, max_results, timeout,
+                           fallback=[], deadline=deadline)
+
+    # Grow the local archive from what we already fetched
+    if results and backend != "ddgs":
+        get_news_index().add_articles(results)
     return results
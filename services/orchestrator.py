@@ -0,0 +1,98 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, as_completed, wait
+
+from config import VERIFY_DEADLINE
+from services.backends import default_backends
+from services.resilience import Deadline
+
+# Shared by every session; the lookups are I/O bound
+executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="verify")
+
+
+def submit_all(tasks, pool=executor):
+    """
+    tasks: {name: (func, args, default)}
+    """
+    return {name: pool.submit(func, *args) for name, (func, args, _) in tasks.items()}
+
+
+def collect(futures, tasks, deadline):
+    """
+    Wait for submitted tasks until a time.monotonic() deadline.
+
+    Returns ({name: value}, [names that missed the deadline or failed]).
+    A call that misses the deadline keeps running in the background, but
+    its result is dropped and the task's default is used instead.
+    """
+    wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+
+    values, missed = {}, []
+    for name, future in futures.items():
+        if future.done() and future.exception() is None:
+            values[name] = future.result()
+        else:
+            future.cancel()
+            values[name] = tasks[name][2]
+            missed.append(name)
+    return values, missed
+
+
+def verify_progressively(cleaned_text, query, wiki_query=None, deadline=None, backends=None):
+    """
+    Model inference, related-article search and the Wikipedia lookup for
+    one (already translated) article, run side by side, yielding
+    (name, value) as each part is ready:
+
+        ("model", {"result", "confidence", "real_prob", "fake_prob"})
+        ("related", [articles]) and ("wiki_text", text) in completion order
+
+    The model runs on the calling thread while the lookups run on the pool,
+    so the first event arrives after the model latency and the whole run
+    takes as long as the slowest of the three. Lookups still pending when
+    the deadline expires yield their empty default and are recorded in
+    deadline.degraded.
+
+    Search hits only count as related once their title and snippet are
+    semantically close enough to the article (services.semantic_match).
+
+    `backends` defaults to services.backends.default_backends().
+    """
+    if deadline is None:
+        deadline = Deadline(VERIFY_DEADLINE)
+    if backends is None:
+        backends = default_backends()
+
+    tasks = {"related": (backends.related, (query, 5, deadline), [])}
+    if wiki_query is not None:
+        tasks["wiki_text"] = (backends.wiki, (wiki_query, deadline), None)
+    futures = submit_all(tasks)
+    names = {future: name for name, future in futures.items()}
+
+    result, confidence, real_prob, fake_prob = backends.predict(cleaned_text)
+    yield "model", {
+        "result": result,
+        "confidence": confidence,
+        "real_prob": real_prob,
+        "fake_prob": fake_prob,
+    }
+
+    pending = set(futures)
+    try:
+        for future in as_completed(futures.values(), timeout=deadline.remaining()):
+            name = names[future]
+            pending.discard(name)
+            if future.exception() is not None:
+                deadline.mark_degraded(name, f"error: {future.exception()}")
+                value = tasks[name][2]
+            else:
+                value = future.result()
+            if name == "related":
+                value = backends.corroborate(cleaned_text, value)
+            yield name, value
+    except FutureTimeout:
+        pass
+
+    for name in sorted(pending):
+        futures[name].cancel()
+        deadline.mark_degraded(name, "deadline exceeded")
+        yield name, tasks[name][2]
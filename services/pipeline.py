@@ -0,0 +1,423 @@
+"""
+The verification pipeline without the UI: translate, clean, predict, find
+related articles, decide the verdict, score clickbait and credibility, and
+summarise. Used by the Streamlit app and by the HTTP API (services.api).
+
+All calls out of the process go through a services.backends.Backends set,
+the live one unless told otherwise. Model, caches and connection pools are
+module-level singletons, so every caller in a process shares them.
+"""
+import hashlib
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from config import VERIFY_DEADLINE
+from services.backends import default_backends
+from services.batch_scoring import score_batch
+from services.credibility_score import compute_credibility_score
+from services.domain_reputation import get_registry, host_of
+from services.explainability import clickbait_score, clickbait_score_batch
+from services.final_decision import combined_verdict, strict_relax_decision
+from services.near_duplicate import NearDuplicateIndex
+from services.orchestrator import collect, submit_all, verify_progressively
+from services.resilience import Deadline
+from services.single_flight import get_single_flight, text_key, url_key
+from services.summary_generator import simple_summary
+from utils.text_cleaner import clean_text
+
+RELAX = "Relax ✅"
+STRICT = "Strict 🔥"
+
+# Shared analyses run here, apart from the lookup pool they fan out to
+analysis_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="analysis")
+# Batch downloads, translations and lookups get their own threads, so a
+# bulk job can't hold up the interactive checks on the shared lookup pool
+batch_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="batch")
+
+
+class ExtractionFailed(Exception):
+    """No article text could be extracted from a URL."""
+
+
+def check_domain(url):
+    """
+    (reputation status, host) for a URL; ("unknown", "—") without one.
+    """
+    if not url:
+        return "unknown", "—"
+    return get_registry().status(url), host_of(url) or "unknown"
+
+
+def analysis_key(news_text, url, mode, enable_translate, enable_wiki):
+    """
+    Hash of the input and every setting that changes the analysis. Texts
+    differing only in case or whitespace, and equivalent URLs, share a key.
+    """
+    payload = json.dumps(
+        [text_key(news_text), url_key(url) if url else "", mode, enable_translate, enable_wiki],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+_duplicate_indexes = {}
+_duplicate_indexes_lock = threading.Lock()
+
+
+def get_duplicate_index(backends=None):
+    # One per backend set, shared by every caller in the process, so
+    # syndicated copies reuse each other's checks
+    name = (backends or default_backends()).name
+    with _duplicate_indexes_lock:
+        if name not in _duplicate_indexes:
+            _duplicate_indexes[name] = NearDuplicateIndex()
+        return _duplicate_indexes[name]
+
+
+def prepare(news_text, enable_translate, enable_wiki, deadline, backends):
+    """
+    Translation and cleaning. Returns (evidence so far, cleaned text,
+    search query, Wikipedia query or None).
+    """
+    detected_lang = "en"
+    if enable_translate:
+        try:
+            news_text, detected_lang = backends.translate(news_text, deadline)
+        except Exception as e:
+            deadline.mark_degraded("translate", f"error: {e}")
+            detected_lang = "unknown"
+
+    cleaned_text = clean_text(news_text)
+    query = " ".join(news_text.split()[:18])
+    wiki_query = " ".join(cleaned_text.split()[:8]) if enable_wiki else None
+
+    evidence = {
+        "english_text": news_text,
+        "detected_lang": detected_lang,
+        "translate": enable_translate,
+        "wiki_enabled": enable_wiki,
+        "wiki_text": None,
+    }
+    return evidence, cleaned_text, query, wiki_query
+
+
+def verify_evidence(news_text, enable_translate, enable_wiki, on_update=None, backends=None):
+    """
+    The expensive part of an analysis: translation, model, related
+    articles and Wikipedia.
+
+    on_update(evidence, pending) is called each time a part arrives while
+    others (names in `pending`) are still outstanding.
+    """
+    backends = backends or default_backends()
+    # One time budget for every outbound call this analysis makes
+    deadline = Deadline(VERIFY_DEADLINE)
+
+    evidence, cleaned_text, query, wiki_query = prepare(
+        news_text, enable_translate, enable_wiki, deadline, backends)
+
+    # Model, related-article search and Wikipedia don't depend on each other
+    pending = {"related", "wiki_text"} if enable_wiki else {"related"}
+    for name, value in verify_progressively(cleaned_text, query, wiki_query, deadline, backends):
+        if name == "model":
+            evidence.update(value)
+        else:
+            evidence[name] = value
+            pending.discard(name)
+        evidence["degraded"] = list(deadline.degraded)
+        if on_update is not None and pending:
+            on_update(evidence, pending)
+    return evidence
+
+
+def build_analysis(evidence, news_text, url, domain_status, domain_name, mode, enable_wiki,
+                   duplicate=None, pending=()):
+    """
+    Everything the result cards show. Fields that depend on a lookup in
+    `pending` are None until it arrives.
+    """
+    news_text = _analysed_text(evidence, news_text)
+    adjusted_label, adjusted_conf = strict_relax_decision(evidence["real_prob"], evidence["fake_prob"], mode)
+    cb_score, cb_level, cb_words = clickbait_score(news_text)
+
+    verdict = cred_score = None
+    if "related" not in pending:
+        related_count = len(evidence["related"])
+        verdict = combined_verdict(evidence["result"], evidence["confidence"], related_count,
+                                   domain_status, news_text)
+        cred_score = compute_credibility_score(evidence["real_prob"], evidence["fake_prob"], related_count,
+                                               domain_status, cb_score)
+
+    return _analysis(evidence, news_text, url, domain_name, enable_wiki, duplicate, pending,
+                     adjusted_label=adjusted_label, adjusted_conf=adjusted_conf, verdict=verdict,
+                     cb_score=cb_score, cb_level=cb_level, cb_words=cb_words, cred_score=cred_score)
+
+
+def build_analyses(rows, mode, enable_wiki):
+    """
+    build_analysis for many complete analyses at once: clickbait, verdicts
+    and credibility are scored over the whole batch (services.batch_scoring).
+
+    rows: [(evidence, news_text, url, domain_status, domain_name, duplicate)]
+    """
+    if not rows:
+        return []
+    texts = [_analysed_text(evidence, news_text) for evidence, news_text, *_ in rows]
+    clickbait = clickbait_score_batch(texts)
+    scores = score_batch(pd.DataFrame({
+        "model_result": [evidence["result"] for evidence, *_ in rows],
+        "confidence": [evidence["confidence"] for evidence, *_ in rows],
+        "real_prob": [evidence["real_prob"] for evidence, *_ in rows],
+        "fake_prob": [evidence["fake_prob"] for evidence, *_ in rows],
+        "related_count": [len(evidence["related"]) for evidence, *_ in rows],
+        "domain_status": [domain_status for _, _, _, domain_status, _, _ in rows],
+        "clickbait_score": clickbait["cb_score"],
+        "text": texts,
+    }), mode)
+
+    analyses = []
+    for (evidence, _, url, _, domain_name, duplicate), text, cb, score in zip(
+            rows, texts, clickbait.to_dict("records"), scores.to_dict("records")):
+        analyses.append(_analysis(
+            evidence, text, url, domain_name, enable_wiki, duplicate, (),
+            adjusted_label=score["adjusted_label"], adjusted_conf=score["adjusted_conf"],
+            verdict=score["verdict"], cb_score=cb["cb_score"], cb_level=cb["cb_level"],
+            cb_words=cb["cb_words"], cred_score=score["credibility"]))
+    return analyses
+
+
+def _analysed_text(evidence, news_text):
+    # the English translation is what gets scored and summarised
+    if evidence["detected_lang"] not in ["en", "unknown"]:
+        return evidence["english_text"]
+    return news_text
+
+
+def _analysis(evidence, news_text, url, domain_name, enable_wiki, duplicate, pending, **scored):
+    return {
+        "time": datetime.now(),
+        "input_type": "URL" if url else "Text",
+        "domain": domain_name,
+        "news_text": news_text,
+        "detected_lang": evidence["detected_lang"],
+        "result": evidence["result"],
+        "confidence": evidence["confidence"],
+        "real_prob": evidence["real_prob"],
+        "fake_prob": evidence["fake_prob"],
+        "adjusted_label": scored["adjusted_label"],
+        "adjusted_conf": scored["adjusted_conf"],
+        "related": None if "related" in pending else evidence["related"],
+        "verdict": scored["verdict"],
+        "summary_text": simple_summary(news_text, max_sentences=3),
+        "cb_score": scored["cb_score"],
+        "cb_level": scored["cb_level"],
+        "cb_words": scored["cb_words"],
+        "cred_score": scored["cred_score"],
+        "wiki_enabled": enable_wiki,
+        "wiki_text": None if "wiki_text" in pending else evidence["wiki_text"],
+        "degraded": evidence.get("degraded", []),
+        "duplicate_similarity": duplicate.similarity if duplicate is not None else None,
+        "pending": sorted(pending),
+    }
+
+
+def reuse_evidence(duplicate, own, deadline):
+    """
+    Evidence for an article from its near-duplicate's: the model result and
+    lookups carry over, but the text (and its translation, `own` from
+    prepare()) is the article's own, so summary and clickbait describe it.
+    """
+    evidence = dict(duplicate.payload)
+    evidence.update(english_text=own["english_text"], detected_lang=own["detected_lang"],
+                    degraded=list(deadline.degraded))
+    return evidence
+
+
+def _find_duplicate(index, news_text, enable_translate, enable_wiki):
+    return index.query(
+        news_text,
+        accept=lambda e: e["translate"] == enable_translate and (e["wiki_enabled"] or not enable_wiki),
+    )
+
+
+def run_analysis(news_text, url, domain_status, domain_name, mode, enable_translate, enable_wiki,
+                 on_update=None, backends=None):
+    """
+    on_update(partial_analysis) is called as the model result and then
+    each lookup arrive, before the complete analysis is returned.
+    """
+    backends = backends or default_backends()
+    index = get_duplicate_index(backends)
+    duplicate = _find_duplicate(index, news_text, enable_translate, enable_wiki)
+    if duplicate is not None:
+        deadline = Deadline(VERIFY_DEADLINE)
+        own, _, _, _ = prepare(news_text, enable_translate, enable_wiki, deadline, backends)
+        evidence = reuse_evidence(duplicate, own, deadline)
+    else:
+        def progress(partial, pending):
+            on_update(build_analysis(partial, news_text, url, domain_status, domain_name,
+                                     mode, enable_wiki, pending=pending))
+
+        evidence = verify_evidence(news_text, enable_translate, enable_wiki,
+                                   progress if on_update is not None else None, backends)
+        if not evidence["degraded"]:
+            index.add(analysis_key(news_text, url, mode, enable_translate, enable_wiki), news_text, evidence)
+
+    return build_analysis(evidence, news_text, url, domain_status, domain_name, mode, enable_wiki, duplicate)
+
+
+def analyze_progressively(news_text, url, domain_status, domain_name, mode, enable_translate,
+                          enable_wiki, backends=None):
+    """
+    run_analysis shared through the single flight, yielding partial
+    analyses as their parts arrive and the complete analysis last.
+
+    The shared computation runs on a worker thread and only queues its
+    partial results; callers render them on their own thread. A caller that
+    stops iterating (e.g. a Streamlit rerun) leaves the computation running
+    for everyone else waiting on the same key.
+    """
+    backends = backends or default_backends()
+    key = _flight_key(analysis_key(news_text, url, mode, enable_translate, enable_wiki), backends)
+    updates = queue.Queue()
+    future = analysis_executor.submit(
+        get_single_flight().do, key, run_analysis, news_text, url, domain_status, domain_name,
+        mode, enable_translate, enable_wiki, on_update=updates.put, backends=backends)
+
+    while not future.done() or not updates.empty():
+        try:
+            yield updates.get(timeout=0.05)
+        except queue.Empty:
+            pass
+    yield future.result()
+
+
+def _flight_key(key, backends):
+    # the app uses the bare keys, so live requests share work with it
+    return key if backends.name == "live" else f"{backends.name}:{key}"
+
+
+def extract(url, backends=None):
+    """
+    Article text of a URL; concurrent requests for the same page share one
+    download. Raises ExtractionFailed.
+    """
+    backends = backends or default_backends()
+    try:
+        text = get_single_flight().do(_flight_key(url_key(url), backends), backends.extract, url)
+    except Exception as e:
+        raise ExtractionFailed(f"Could not extract {url}: {e}") from e
+    if not text or not text.strip():
+        raise ExtractionFailed(f"No article text found at {url}")
+    return text
+
+
+def verify(text="", url="", mode=RELAX, enable_translate=True, enable_wiki=False, backends=None):
+    """
+    Analyse one article given as text, a URL or both; with both, the text
+    is analysed and the URL only decides the domain. Identical requests
+    running at the same time (in any process) are computed once.
+    """
+    backends = backends or default_backends()
+    url = (url or "").strip()
+    if not (text or "").strip():
+        if not url:
+            raise ValueError("Either text or url is required")
+        text = extract(url, backends)
+    domain_status, domain_name = check_domain(url)
+
+    key = analysis_key(text, url, mode, enable_translate, enable_wiki)
+    return get_single_flight().do(
+        _flight_key(key, backends), run_analysis, text, url, domain_status, domain_name, mode,
+        enable_translate, enable_wiki, backends=backends)
+
+
+def verify_batch(items, mode=RELAX, enable_translate=True, enable_wiki=False, backends=None,
+                 budget=VERIFY_DEADLINE):
+    """
+    Analyse many articles ({"text", "url"} dicts) together: downloads,
+    translations and lookups run concurrently and the model sees one
+    batch. Repeated texts are analysed once, and near-duplicates of earlier
+    analyses reuse them. `budget` is each article's time for lookups;
+    rate-limited bulk runs need more than a single check.
+
+    Returns one analysis per item, in order, or {"error": message} for
+    items that couldn't be analysed.
+    """
+    backends = backends or default_backends()
+    items = [{"text": item.get("text") or "", "url": (item.get("url") or "").strip()} for item in items]
+    out = [None] * len(items)
+
+    def load(item):
+        if item["text"].strip():
+            return item["text"]
+        if not item["url"]:
+            raise ValueError("Either text or url is required")
+        return extract(item["url"], backends)
+
+    texts = {}
+    for i, future in enumerate([batch_executor.submit(load, item) for item in items]):
+        try:
+            texts[i] = future.result()
+        except (ValueError, ExtractionFailed) as e:
+            out[i] = {"error": str(e)}
+
+    index = get_duplicate_index(backends)
+    duplicates, todo = {}, []
+    # item -> the first item in this batch with the same text
+    first, source = {}, {}
+    for i, text in texts.items():
+        source[i] = first.setdefault(text_key(text), i)
+        if source[i] != i:
+            continue
+        duplicate = _find_duplicate(index, text, enable_translate, enable_wiki)
+        if duplicate is not None:
+            duplicates[i] = duplicate
+        else:
+            todo.append(i)
+
+    # near-duplicates are translated too: only their evidence is reused
+    deadlines = {i: Deadline(budget) for i in todo + list(duplicates)}
+    prepared = dict(zip(deadlines, batch_executor.map(
+        lambda i: prepare(texts[i], enable_translate, enable_wiki, deadlines[i], backends), deadlines)))
+
+    # lookups first, so they run while the model works through the batch
+    lookups = {}
+    for i in todo:
+        _, _, query, wiki_query = prepared[i]
+        tasks = {"related": (backends.related, (query, 5, deadlines[i]), [])}
+        if wiki_query is not None:
+            tasks["wiki_text"] = (backends.wiki, (wiki_query, deadlines[i]), None)
+        lookups[i] = (tasks, submit_all(tasks, batch_executor))
+
+    predictions = backends.predict_batch([prepared[i][1] for i in todo]) if todo else []
+
+    evidences = {i: reuse_evidence(duplicate, prepared[i][0], deadlines[i]) for i, duplicate in duplicates.items()}
+    for i, (result, confidence, real_prob, fake_prob) in zip(todo, predictions):
+        evidence, cleaned_text, _, _ = prepared[i]
+        tasks, futures = lookups[i]
+        values, missed = collect(futures, tasks, deadlines[i].expires)
+        for name in missed:
+            deadlines[i].mark_degraded(name, "failed or deadline exceeded")
+        if "related" not in missed:
+            values["related"] = backends.corroborate(cleaned_text, values["related"])
+        evidence.update(values)
+        evidence.update(result=result, confidence=confidence, real_prob=real_prob, fake_prob=fake_prob,
+                        degraded=list(deadlines[i].degraded))
+        evidences[i] = evidence
+        if not evidence["degraded"]:
+            key = analysis_key(texts[i], items[i]["url"], mode, enable_translate, enable_wiki)
+            index.add(key, texts[i], evidence)
+
+    rows = []
+    for i, text in texts.items():
+        rows.append((evidences[source[i]], text, items[i]["url"], *check_domain(items[i]["url"]),
+                     duplicates.get(source[i])))
+    for i, analysis in zip(texts, build_analyses(rows, mode, enable_wiki)):
+        out[i] = analysis
+    return out
@@ -1,3 +1,4 @@
+import numpy as np
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
@@ -13,26 +14,63 @@ model.eval()
 
 
 def predict_news(text: str):
-    if not text or len(text.strip()) == 0:
-        return "No text provided", 0.0, 0.0, 0.0
-
-    inputs = tokenizer(
-        text,
-        return_tensors="pt",
-        truncation=True,
-        padding="max_length",
-        max_length=256
-    )
-    inputs = {k: v.to(device) for k, v in inputs.items()}
-
-    with torch.no_grad():
-        outputs = model(**inputs)
-        probs = torch.softmax(outputs.logits, dim=1)
-
-    real_prob = float(probs[0][0])
-    fake_prob = float(probs[0][1])
-
-    if fake_prob > real_prob:
-        return "Fake News", fake_prob, real_prob, fake_prob
-    else:
-        return "Real News", real_prob, real_prob, fake_prob
+    return predict_news_batch([text])[0]
+
+
+def predict_news_batch(texts, batch_size=16):
+    """
+    predict_news for many texts, in batches. Every text is padded to the
+    same max_length whether it is scored alone or in a batch, so the single
+    check, the API and bulk jobs give the same probabilities.
+    """
+    results = [("No text provided", 0.0, 0.0, 0.0)] * len(texts)
+    order = [i for i, text in enumerate(texts) if text and text.strip()]
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        inputs = tokenizer(
+            [texts[i] for i in batch],
+            return_tensors="pt",
+            truncation=True,
+            padding="max_length",
+            max_length=256
+        )
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+
+        with torch.no_grad():
+            probs = torch.softmax(model(**inputs).logits, dim=1).cpu()
+
+        for i, row in zip(batch, probs):
+            real_prob, fake_prob = float(row[0]), float(row[1])
+            if fake_prob > real_prob:
+                results[i] = ("Fake News", fake_prob, real_prob, fake_prob)
+            else:
+                results[i] = ("Real News", real_prob, real_prob, fake_prob)
+    return results
+
+
+def embed_texts(texts, batch_size=16, max_length=256):
+    """
+    L2-normalised mean-pooled last hidden states, one float32 row per text.
+    """
+    vectors = []
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(
+            list(texts[start:start + batch_size]),
+            return_tensors="pt",
+            truncation=True,
+            padding=True,
+            max_length=max_length
+        )
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+
+        with torch.no_grad():
+            hidden = model(**inputs, output_hidden_states=True).hidden_states[-1]
+
+        mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+        pooled = torch.nn.functional.normalize(pooled, dim=-1)
+        vectors.append(pooled.float().cpu().numpy())
+
+    if not vectors:
+        return np.zeros((0, model.config.hidden_size), dtype=np.float32)
+    return np.concatenate(vectors)
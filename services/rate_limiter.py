@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from config import RATE_LIMIT_DB, RATE_LIMITS
+
+
+class RateLimited(Exception):
+    """No slot became free for a backend before the caller's timeout."""
+
+
+def is_throttle(exc):
+    """
+    True for "slow down" answers: HTTP 429 or a client's rate-limit error.
+    """
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return "ratelimit" in type(exc).__name__.lower()
+
+
+class SharedRateLimiter:
+    """
+    Token bucket plus AIMD concurrency limit per backend, with the state in
+    SQLite so every Streamlit worker and batch process on the machine draws
+    from the same quota.
+
+    Each call needs a token (refilled at `rate` per second up to `burst`)
+    and a lease under the backend's current concurrency limit. The limit
+    grows by one per limit-worth of successes and halves on a throttle or
+    error, so throughput settles just under what the backend accepts.
+    Leases expire after `lease_seconds` so a crashed process can't hold
+    slots forever.
+    """
+
+    def __init__(self, path=RATE_LIMIT_DB, limits=RATE_LIMITS, lease_seconds=120):
+        self.path = path
+        self.limits = limits
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "backend TEXT PRIMARY KEY, tokens REAL, updated REAL, concurrency REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases (id TEXT PRIMARY KEY, backend TEXT, expires REAL)"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _bucket(self, conn, backend, now):
+        quota = self.limits[backend]
+        row = conn.execute(
+            "SELECT tokens, updated, concurrency FROM buckets WHERE backend = ?", (backend,)
+        ).fetchone()
+        if row is None:
+            row = (float(quota["burst"]), now, float(quota["max_concurrency"]))
+            conn.execute("INSERT INTO buckets VALUES (?, ?, ?, ?)", (backend, *row))
+        tokens, updated, concurrency = row
+        tokens = min(float(quota["burst"]), tokens + max(0.0, now - updated) * quota["rate"])
+        return tokens, concurrency
+
+    def try_acquire(self, backend):
+        """
+        Take a token and a lease if both are available.
+
+        Returns (lease_id, 0) on success, or (None, seconds to wait).
+        """
+        quota = self.limits[backend]
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            tokens, concurrency = self._bucket(conn, backend, now)
+            conn.execute("DELETE FROM leases WHERE expires < ?", (now,))
+            in_flight = conn.execute(
+                "SELECT COUNT(*) FROM leases WHERE backend = ?", (backend,)
+            ).fetchone()[0]
+
+            lease_id = None
+            if tokens >= 1 and in_flight < max(1, int(concurrency)):
+                tokens -= 1
+                lease_id = uuid.uuid4().hex
+                conn.execute(
+                    "INSERT INTO leases VALUES (?, ?, ?)", (lease_id, backend, now + self.lease_seconds)
+                )
+            conn.execute(
+                "UPDATE buckets SET tokens = ?, updated = ? WHERE backend = ?", (tokens, now, backend)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        if lease_id is not None:
+            return lease_id, 0.0
+        if tokens < 1:
+            return None, (1 - tokens) / quota["rate"]
+        # waiting on a concurrency slot: poll
+        return None, 0.05
+
+    def acquire(self, backend, timeout=None):
+        """
+        Block until a slot is free and return its lease id.
+        Raises RateLimited if none frees up within `timeout` seconds.
+        """
+        give_up = None if timeout is None else time.monotonic() + timeout
+        while True:
+            lease_id, wait = self.try_acquire(backend)
+            if lease_id is not None:
+                return lease_id
+            if give_up is not None:
+                left = give_up - time.monotonic()
+                if left <= 0 or wait > left:
+                    raise RateLimited(f"{backend}: no slot within {timeout:.1f}s")
+            time.sleep(min(wait, 1.0))
+
+    def release(self, backend, lease_id, ok=True, throttled=False):
+        """
+        Return a lease and adapt the backend's concurrency limit:
+        additive increase on success, multiplicative decrease otherwise,
+        and no change with ok=None (the slot was never used).
+        """
+        quota = self.limits[backend]
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            tokens, concurrency = self._bucket(conn, backend, now)
+            if ok is None:
+                pass
+            elif ok:
+                concurrency = min(float(quota["max_concurrency"]), concurrency + 1.0 / max(1.0, concurrency))
+            else:
+                concurrency = max(1.0, concurrency / 2)
+            if throttled:
+                # the backend asked us to slow down: drop the saved-up burst too
+                tokens = min(tokens, 0.0)
+            conn.execute("DELETE FROM leases WHERE id = ?", (lease_id,))
+            conn.execute(
+                "UPDATE buckets SET tokens = ?, updated = ?, concurrency = ? WHERE backend = ?",
+                (tokens, now, concurrency, backend),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def state(self, backend):
+        conn = self._connect()
+        now = time.time()
+        tokens, concurrency = self._bucket(conn, backend, now)
+        in_flight = conn.execute(
+            "SELECT COUNT(*) FROM leases WHERE backend = ? AND expires >= ?", (backend, now)
+        ).fetchone()[0]
+        return {"tokens": tokens, "concurrency": concurrency, "in_flight": in_flight}
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = SharedRateLimiter()
+        return _limiter
@@ -0,0 +1,200 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from config import (BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS, DEFAULT_DEPENDENCY_WORKERS,
+                    DEPENDENCY_TIMEOUTS, DEPENDENCY_WORKERS, RATE_LIMITS)
+from services.rate_limiter import RateLimited, get_limiter, is_throttle
+
+DEFAULT_TIMEOUT = 10
+
+_RAISE = object()
+
+
+class DependencyError(Exception):
+    """An external dependency timed out, failed, or has its circuit open."""
+
+    def __init__(self, dependency, reason):
+        super().__init__(f"{dependency}: {reason}")
+        self.dependency = dependency
+        self.reason = reason
+
+
+class Deadline:
+    """
+    Time budget for one request, shared by every outbound call it makes.
+
+    Calls that fall back to a default record themselves in `degraded` so
+    the caller can tell a partial result from a complete one.
+    """
+
+    def __init__(self, budget):
+        self.expires = time.monotonic() + budget
+        self.degraded = []
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def mark_degraded(self, dependency, reason):
+        with self._lock:
+            self.degraded.append((dependency, reason))
+
+
+class CircuitBreaker:
+    """
+    Fails fast after `threshold` consecutive failures, then lets a single
+    trial call through every `reset_after` seconds until one succeeds.
+    """
+
+    def __init__(self, threshold=BREAKER_FAILURE_THRESHOLD, reset_after=BREAKER_RESET_SECONDS):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_after:
+                # half-open: push the window forward so only this call probes
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(dependency):
+    with _breakers_lock:
+        if dependency not in _breakers:
+            _breakers[dependency] = CircuitBreaker()
+        return _breakers[dependency]
+
+
+# Outbound calls run on a pool per dependency, so a hung socket can't hold
+# the caller past its timeout and one stuck service can't take the threads
+# every other dependency needs
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def pool(dependency):
+    with _pools_lock:
+        if dependency not in _pools:
+            _pools[dependency] = ThreadPoolExecutor(
+                max_workers=DEPENDENCY_WORKERS.get(dependency, DEFAULT_DEPENDENCY_WORKERS),
+                thread_name_prefix=f"outbound-{dependency}",
+            )
+        return _pools[dependency]
+
+
+def dependency_timeout(dependency, deadline=None):
+    timeout = DEPENDENCY_TIMEOUTS.get(dependency, DEFAULT_TIMEOUT)
+    if deadline is not None:
+        timeout = min(timeout, deadline.remaining())
+    return timeout
+
+
+def guarded_call(dependency, func, *args, fallback=_RAISE, deadline=None, circuit_key=None, **kwargs):
+    """
+    Call an external dependency under its timeout, the request deadline and
+    its circuit breaker.
+
+    On timeout, error or open circuit the call is recorded as degraded on
+    `deadline` and `fallback` is returned; without a fallback a
+    DependencyError is raised instead. `circuit_key` gives a dependency
+    several breakers, e.g. one per site for article downloads.
+
+    Dependencies listed in config.RATE_LIMITS first wait for a slot from
+    the process-shared rate limiter. The wait comes out of `deadline` (or
+    the dependency's timeout without one), so the call itself still gets
+    its whole timeout; waits, and calls cut short by the deadline, don't
+    count against the circuit breaker.
+    """
+    def fail(reason, cause=None):
+        if deadline is not None:
+            deadline.mark_degraded(dependency, reason)
+        if fallback is _RAISE:
+            raise DependencyError(dependency, reason) from cause
+        return fallback
+
+    circuit = breaker(circuit_key or dependency)
+    if not circuit.allow():
+        return fail("circuit open")
+
+    timeout = dependency_timeout(dependency, deadline)
+    if timeout <= 0:
+        return fail("deadline exceeded")
+
+    lease_id = None
+    if dependency in RATE_LIMITS:
+        try:
+            lease_id = get_limiter().acquire(
+                dependency, timeout=deadline.remaining() if deadline is not None else timeout)
+        except RateLimited as e:
+            return fail("rate limited", e)
+        timeout = dependency_timeout(dependency, deadline)
+        if timeout <= 0:
+            get_limiter().release(dependency, lease_id, ok=None)
+            return fail("deadline exceeded")
+    # a timeout the deadline shortened says nothing about the service
+    truncated = timeout < DEPENDENCY_TIMEOUTS.get(dependency, DEFAULT_TIMEOUT)
+
+    future = pool(dependency).submit(func, *args, **kwargs)
+    timed_out = threading.Event()
+    if lease_id is not None:
+        # The slot is held until the call really finishes, even if we stop waiting
+        future.add_done_callback(lambda f: _release(dependency, lease_id, f, timed_out))
+    try:
+        value = future.result(timeout=timeout)
+    except FutureTimeout as e:
+        if not truncated:
+            timed_out.set()
+            circuit.record_failure()
+        # still queued behind hung calls: drop it rather than run it later
+        future.cancel()
+        return fail(f"timed out after {timeout:.1f}s", e)
+    except Exception as e:
+        circuit.record_failure()
+        return fail(f"error: {e}", e)
+
+    circuit.record_success()
+    return value
+
+
+def _release(dependency, lease_id, future, timed_out):
+    if future.cancelled():
+        # never reached the service, so it says nothing about its load
+        get_limiter().release(dependency, lease_id, ok=None)
+        return
+    # a call that outran its timeout is congestion, even if it got an answer later
+    exc = future.exception()
+    get_limiter().release(dependency, lease_id, ok=exc is None and not timed_out.is_set(),
+                          throttled=exc is not None and is_throttle(exc))
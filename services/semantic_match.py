@@ -0,0 +1,267 @@
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from config import EMBEDDING_CACHE_DIR, SEMANTIC_CALIBRATION_PAIRS, SEMANTIC_MATCH_THRESHOLD
+
+# Rows scored per block in top_k, so the memmap is never read in one piece
+BLOCK_ROWS = 65536
+
+
+class EmbeddingStore:
+    """
+    Per-URL embedding cache: a float16 matrix in one flat file, memory
+    mapped for reads, plus a SQLite index of url -> row.
+
+    Writers append under a SQLite write lock, so several processes can
+    share the store; a row only becomes visible once its index entry is
+    committed.
+    """
+
+    def __init__(self, directory, dim):
+        self.dim = dim
+        self.row_bytes = dim * np.dtype(np.float16).itemsize
+        self.vectors_path = os.path.join(directory, "vectors.f16")
+        self._local = threading.local()
+        self._matrix = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, "index.sqlite3")
+
+        conn = self._connect()
+        conn.execute("CREATE TABLE IF NOT EXISTS rows (url TEXT PRIMARY KEY, row INTEGER UNIQUE)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("INSERT OR IGNORE INTO meta VALUES ('dim', ?)", (str(dim),))
+        stored = int(conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()[0])
+        if stored != dim:
+            raise ValueError(f"{directory} holds {stored}-d embeddings, not {dim}-d")
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def matrix(self):
+        """
+        Read-only (n, dim) float16 view of every committed row.
+        """
+        n = len(self)
+        with self._lock:
+            if self._matrix is None or len(self._matrix) != n:
+                if n == 0:
+                    self._matrix = np.zeros((0, self.dim), dtype=np.float16)
+                else:
+                    self._matrix = np.memmap(self.vectors_path, dtype=np.float16, mode="r", shape=(n, self.dim))
+            return self._matrix
+
+    def get_many(self, urls):
+        """
+        {url: float32 vector} for the urls that are cached.
+        """
+        rows = {}
+        conn = self._connect()
+        urls = list(dict.fromkeys(urls))
+        for start in range(0, len(urls), 500):
+            batch = urls[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            rows.update(conn.execute(f"SELECT url, row FROM rows WHERE url IN ({marks})", batch).fetchall())
+        if not rows:
+            return {}
+        matrix = self.matrix()
+        return {url: np.asarray(matrix[row], dtype=np.float32) for url, row in rows.items() if row < len(matrix)}
+
+    def add_many(self, urls, vectors):
+        vectors = np.asarray(vectors, dtype=np.float16).reshape(-1, self.dim)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            n = conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+            fd = os.open(self.vectors_path, os.O_WRONLY | os.O_CREAT, 0o644)
+            try:
+                for url, vector in zip(urls, vectors):
+                    if conn.execute("SELECT 1 FROM rows WHERE url = ?", (url,)).fetchone():
+                        continue
+                    # a row left behind by a writer that died before committing is overwritten
+                    os.pwrite(fd, vector.tobytes(), n * self.row_bytes)
+                    conn.execute("INSERT INTO rows VALUES (?, ?)", (url, n))
+                    n += 1
+            finally:
+                os.close(fd)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def top_k(self, query, k=5):
+        """
+        Brute-force cosine search over the whole store: [(url, score)], best first.
+        """
+        matrix = self.matrix()
+        if len(matrix) == 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        scores = np.concatenate([
+            matrix[start:start + BLOCK_ROWS].astype(np.float32) @ query
+            for start in range(0, len(matrix), BLOCK_ROWS)
+        ])
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+
+        conn = self._connect()
+        marks = ",".join("?" * len(best))
+        urls = dict(conn.execute(
+            f"SELECT row, url FROM rows WHERE row IN ({marks})", [int(i) for i in best]
+        ).fetchall())
+        return [(urls[int(i)], float(scores[i])) for i in best]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _embed(texts):
+    # the model is only loaded once something actually needs embedding
+    from services.predictor import embed_texts
+    return embed_texts(texts)
+
+
+def get_store(dim):
+    global _store
+    with _store_lock:
+        if _store is None:
+            from services.predictor import MODEL_PATH
+            _store = EmbeddingStore(os.path.join(EMBEDDING_CACHE_DIR, MODEL_PATH.replace("/", "--")), dim)
+        return _store
+
+
+def candidate_text(article):
+    return f"{article.get('title') or ''}. {article.get('snippet') or ''}".strip()
+
+
+def score_candidates(text, articles, embed=_embed):
+    """
+    Cosine similarity between text and each article's title + snippet.
+
+    Article embeddings are cached by URL, so an article that turns up for
+    many claims is only embedded once.
+    """
+    if not articles:
+        return []
+    query = embed([text])[0]
+    store = get_store(len(query))
+
+    urls = [a.get("link") for a in articles]
+    cached = store.get_many([u for u in urls if u])
+    missing = [i for i, url in enumerate(urls) if url not in cached]
+    if missing:
+        vectors = embed([candidate_text(articles[i]) for i in missing])
+        fresh = {i: v for i, v in zip(missing, vectors)}
+        new_urls = {urls[i]: fresh[i] for i in missing if urls[i]}
+        if new_urls:
+            store.add_many(list(new_urls), np.stack(list(new_urls.values())))
+    else:
+        fresh = {}
+
+    return [
+        float(np.dot(query, cached[url] if i not in fresh else fresh[i]))
+        for i, url in enumerate(urls)
+    ]
+
+
+def load_pairs(path=SEMANTIC_CALIBRATION_PAIRS):
+    """
+    [(related, claim, hit)] from a labelled pairs file.
+    """
+    pairs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith(";"):
+                continue
+            label, claim, hit = line.rstrip("\n").split("\t")
+            if label not in ("related", "unrelated"):
+                raise ValueError(f"{path}: unknown label {label!r}")
+            pairs.append((label == "related", claim, hit))
+    return pairs
+
+
+def calibrate_threshold(related, unrelated):
+    """
+    The similarity cutoff that best separates the scores of related pairs
+    from those of unrelated ones (highest balanced accuracy).
+    """
+    related = np.asarray(related, dtype=np.float64)
+    unrelated = np.asarray(unrelated, dtype=np.float64)
+    scores = np.unique(np.concatenate([related, unrelated]))
+    # a cut between every two neighbouring scores, and one past each end
+    cuts = np.concatenate([[scores[0] - 1e-6], (scores[:-1] + scores[1:]) / 2, [scores[-1] + 1e-6]])
+    accuracy = ((related >= cuts[:, None]).mean(axis=1) + (unrelated < cuts[:, None]).mean(axis=1)) / 2
+    best = np.flatnonzero(accuracy == accuracy.max())
+    return float(cuts[best[len(best) // 2]])
+
+
+def calibration(pairs=None, embed=_embed):
+    """
+    (threshold, related pairs' scores, unrelated pairs' scores) for the
+    labelled pairs, by default those in config.SEMANTIC_CALIBRATION_PAIRS.
+    """
+    pairs = load_pairs() if pairs is None else pairs
+    vectors = embed([claim for _, claim, _ in pairs] + [hit for _, _, hit in pairs])
+    scores = np.einsum("ij,ij->i", vectors[:len(pairs)], vectors[len(pairs):])
+    related = np.array([label for label, _, _ in pairs])
+    return calibrate_threshold(scores[related], scores[~related]), scores[related], scores[~related]
+
+
+_thresholds = {}
+_thresholds_lock = threading.Lock()
+
+
+def match_threshold(embed=_embed):
+    """
+    config.SEMANTIC_MATCH_THRESHOLD, or the threshold calibrated for
+    `embed` when that is None (computed once per process).
+    """
+    if SEMANTIC_MATCH_THRESHOLD is not None:
+        return SEMANTIC_MATCH_THRESHOLD
+    with _thresholds_lock:
+        if embed not in _thresholds:
+            _thresholds[embed] = calibration(embed=embed)[0]
+        return _thresholds[embed]
+
+
+def corroborating(text, articles, threshold=None, embed=_embed):
+    """
+    The articles whose content actually matches text, best first, each
+    with its "similarity" added. `threshold` defaults to match_threshold().
+    """
+    if not articles:
+        return []
+    if threshold is None:
+        threshold = match_threshold(embed)
+    scores = score_candidates(text, articles, embed=embed)
+    matched = [
+        {**article, "similarity": round(score, 3)}
+        for article, score in zip(articles, scores)
+        if score >= threshold
+    ]
+    return sorted(matched, key=lambda a: a["similarity"], reverse=True)
+
+
+def main():
+    threshold, related, unrelated = calibration()
+    print(f"threshold {threshold:.4f} from {len(related)} related and {len(unrelated)} unrelated pairs")
+    print(f"  related:   min {related.min():.4f}  median {np.median(related):.4f}")
+    print(f"  unrelated: max {unrelated.max():.4f}  median {np.median(unrelated):.4f}")
+    print(f"  misplaced: {(related < threshold).sum()} related, {(unrelated >= threshold).sum()} unrelated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+try:
+    import fcntl
+except ImportError:  # Windows: deduplicate within the process only
+    fcntl = None
+
+from config import SINGLE_FLIGHT_DIR, SINGLE_FLIGHT_TIMEOUT
+from utils.text_cleaner import clean_text
+
+# Result files older than this are stale leftovers and get removed
+RESULT_TTL = 60
+POLL_SECONDS = 0.05
+
+
+class SingleFlightTimeout(Exception):
+    """The in-flight computation a caller was waiting on didn't finish in time."""
+
+
+def url_key(url):
+    """
+    Key for a URL that ignores case of scheme/host, "www.", fragments,
+    tracking parameters, query order and a trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in ("fbclid", "gclid")
+    )
+    normalized = urlunsplit((parts.scheme.lower() or "http", host, parts.path.rstrip("/"), urlencode(query), ""))
+    return "url:" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def text_key(text):
+    return "text:" + hashlib.sha256(clean_text(text).encode("utf-8")).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        # the leader was interrupted (KeyboardInterrupt, a UI rerun, ...);
+        # that's not an outcome to hand to anyone else
+        self.abandoned = False
+
+
+class SingleFlight:
+    """
+    Runs one computation per key at a time and hands its result (or
+    exception) to every caller that asked for the same key meanwhile.
+
+    Threads of one process wait on an Event. Across processes the leader
+    holds an flock on a per-key lock file and leaves its pickled outcome
+    next to it; other processes wait for the lock and read that file
+    instead of computing again.
+    """
+
+    def __init__(self, directory=SINGLE_FLIGHT_DIR, timeout=SINGLE_FLIGHT_TIMEOUT):
+        self.directory = directory
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        if fcntl is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        func(*args, **kwargs), shared with concurrent callers of the same key.
+        Raises SingleFlightTimeout if a shared call takes longer than the timeout.
+
+        Only results and Exceptions are shared. If the leader is interrupted
+        by a BaseException, it propagates in the leader alone and the
+        waiting callers start over, one of them as the new leader.
+        """
+        give_up = time.monotonic() + self.timeout
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+
+            if leader:
+                break
+            if not call.done.wait(max(0.0, give_up - time.monotonic())):
+                raise SingleFlightTimeout(f"{key}: still running after {self.timeout}s")
+            if not call.abandoned:
+                if call.error is not None:
+                    raise call.error
+                return call.value
+
+        try:
+            call.value = self._run_shared(key, func, args, kwargs)
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            call.abandoned = True
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _paths(self, key):
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, name)
+        return base + ".lock", base + ".result"
+
+    def _run_shared(self, key, func, args, kwargs):
+        if fcntl is None:
+            return func(*args, **kwargs)
+
+        lock_path, result_path = self._paths(key)
+        started = time.time()
+        give_up = time.monotonic() + self.timeout
+        with open(lock_path, "a") as lock_file:
+            waited = False
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    waited = True
+                    if time.monotonic() >= give_up:
+                        raise SingleFlightTimeout(f"{key}: still running after {self.timeout}s")
+                    time.sleep(POLL_SECONDS)
+            os.utime(lock_path)
+
+            try:
+                if waited:
+                    outcome = self._read_result(result_path, started)
+                    if outcome is not None:
+                        ok, value = outcome
+                        if ok:
+                            return value
+                        raise value
+                    # the other process died without leaving a result: compute it here
+
+                try:
+                    value = func(*args, **kwargs)
+                except Exception as e:
+                    self._write_result(result_path, (False, e))
+                    raise
+                self._write_result(result_path, (True, value))
+                return value
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                self._sweep()
+
+    @staticmethod
+    def _read_result(path, since):
+        try:
+            if os.path.getmtime(path) < since:
+                return None
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    @staticmethod
+    def _write_result(path, outcome):
+        try:
+            payload = pickle.dumps(outcome)
+        except Exception:
+            if outcome[0]:
+                return
+            # an unpicklable exception still reaches other processes as a RuntimeError
+            payload = pickle.dumps((False, RuntimeError(repr(outcome[1]))))
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+
+    def _sweep(self):
+        cutoff = time.time() - RESULT_TTL
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                # removing an idle lock file can at worst let one later call
+                # run twice, never hand out a wrong result
+                if entry.name.endswith((".result", ".lock")) and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+
+_flights = None
+_flights_lock = threading.Lock()
+
+
+def get_single_flight():
+    global _flights
+    with _flights_lock:
+        if _flights is None:
+            _flights = SingleFlight()
+        return _flights
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from deep_translator import GoogleTranslator
+
+from config import TRANSLATION_CACHE_DB
+from services.language_id import detect
+from services.resilience import guarded_call
+
+# Google Translate rejects requests over 5000 characters
+MAX_CHUNK_CHARS = 4500
+
+# Splits after sentence punctuation, keeping the whitespace with the sentence
+SENTENCE_END = re.compile(r"(?<=[.!?。！？])(\s+)")
+
+executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="translate")
+
+
+def _split_long(piece, limit):
+    # A single "sentence" over the limit: break on whitespace, then hard-cut
+    parts, current = [], ""
+    for word in re.split(r"(?<=\s)", piece):
+        while len(word) > limit:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(word[:limit])
+            word = word[limit:]
+        if len(current) + len(word) > limit:
+            parts.append(current)
+            current = ""
+        current += word
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_chunks(text, limit=MAX_CHUNK_CHARS):
+    """
+    Split text on sentence boundaries into chunks of at most `limit`
+    characters. "".join(split_chunks(text)) == text.
+    """
+    pieces = SENTENCE_END.split(text)
+    # re.split with a group alternates sentence, whitespace, sentence, ...
+    sentences = [
+        pieces[i] + (pieces[i + 1] if i + 1 < len(pieces) else "")
+        for i in range(0, len(pieces), 2)
+    ]
+
+    chunks, current = [], ""
+    for sentence in sentences:
+        if len(sentence) > limit:
+            parts = _split_long(sentence, limit)
+        else:
+            parts = [sentence]
+        for part in parts:
+            if current and len(current) + len(part) > limit:
+                chunks.append(current)
+                current = ""
+            current += part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class TranslationCache:
+    """
+    Persistent (source language, chunk hash) -> English translation.
+    """
+
+    def __init__(self, path=TRANSLATION_CACHE_DB):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "source TEXT, digest TEXT, translated TEXT, PRIMARY KEY (source, digest))"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def digest(chunk):
+        return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+    def get_many(self, source, chunks):
+        digests = [self.digest(chunk) for chunk in chunks]
+        found = {}
+        conn = self._connect()
+        for start in range(0, len(digests), 500):
+            batch = digests[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            found.update(conn.execute(
+                f"SELECT digest, translated FROM translations WHERE source = ? AND digest IN ({marks})",
+                (source, *batch),
+            ).fetchall())
+        return [found.get(d) for d in digests]
+
+    def put(self, source, chunk, translated):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO translations VALUES (?, ?, ?)",
+            (source, self.digest(chunk), translated),
+        )
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TranslationCache()
+        return _cache
+
+
+def _translate_chunk(chunk, deadline=None):
+    translator = GoogleTranslator(source="auto", target="en")
+    return guarded_call("translate", translator.translate, chunk, deadline=deadline)
+
+
+def translate_text(text, source, deadline=None):
+    """
+    Translate text from `source` to English chunk by chunk.
+
+    Cached chunks cost nothing; the rest are translated concurrently and
+    reassembled in order with their original separating whitespace.
+    Raises DependencyError if any chunk can't be translated.
+    """
+    chunks = split_chunks(text)
+    cache = get_cache()
+    translated = cache.get_many(source, chunks)
+
+    missing = [i for i, value in enumerate(translated) if value is None and chunks[i].strip()]
+    futures = {i: executor.submit(_translate_chunk, chunks[i].strip(), deadline) for i in missing}
+    error = None
+    for i, future in futures.items():
+        try:
+            translated[i] = future.result()
+        except Exception as e:
+            error = error or e
+            continue
+        cache.put(source, chunks[i], translated[i])
+    if error is not None:
+        raise error
+
+    out = []
+    for chunk, value in zip(chunks, translated):
+        if value is None:
+            # whitespace-only chunk
+            out.append(chunk)
+            continue
+        trailing = chunk[len(chunk.rstrip()):]
+        out.append(value + (trailing or " "))
+    return "".join(out).strip()
+
+
+def translate_to_english(text, deadline=None):
+    """
+    Returns (english_text, detected_language).
+    """
+    lang = detect(text)
+    if lang in ("en", "unknown"):
+        return text, lang
+    return translate_text(text, lang, deadline), lang
@@ -1,7 +1,193 @@
-from newspaper import Article
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
-def extract_text_from_url(url):
-    article = Article(url)
-    article.download()
+import requests
+from requests.adapters import HTTPAdapter
+from newspaper import Article, Config
+
+from config import (URL_CACHE_DB, URL_CACHE_FRESH_SECONDS, URL_CACHE_MAX_AGE,
+                    URL_CONNECT_TIMEOUT, URL_MAX_BYTES)
+from services.resilience import DependencyError, dependency_timeout, guarded_call
+
+USER_AGENT = "Mozilla/5.0 (compatible; FakeGuard/1.0; +https://github.com/maheshh4x/fake-news-detection)"
+
+# extract_many fans out here; the downloads themselves run on the resilience pool
+executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ingest")
+
+
+class PageTooLarge(Exception):
+    """The response body is over URL_MAX_BYTES."""
+
+
+def _make_session():
+    session = requests.Session()
+    # keep-alive connections are reused per host across downloads and threads
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+session = _make_session()
+
+
+class PageCache:
+    """
+    On-disk url -> (validators, compressed HTML, extracted text) cache.
+    """
+
+    def __init__(self, path=URL_CACHE_DB, max_age=URL_CACHE_MAX_AGE):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, html BLOB, text TEXT, fetched REAL)"
+        )
+        conn.execute("DELETE FROM pages WHERE fetched < ?", (time.time() - max_age,))
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, url):
+        row = self._connect().execute(
+            "SELECT etag, last_modified, html, text, fetched FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, html, text, fetched = row
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "html": zlib.decompress(html).decode("utf-8"),
+            "text": text,
+            "fetched": fetched,
+        }
+
+    def put(self, url, etag, last_modified, html, text):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, zlib.compress(html.encode("utf-8")), text, time.time()),
+        )
+
+    def touch(self, url):
+        self._connect().execute("UPDATE pages SET fetched = ? WHERE url = ?", (time.time(), url))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageCache()
+        return _cache
+
+
+def fetch_html(url, timeout, cached=None):
+    """
+    GET url on the pooled session, revalidating `cached` when given.
+
+    Returns (html, etag, last_modified), or None when the server answers
+    304 Not Modified. Raises PageTooLarge for bodies over URL_MAX_BYTES.
+    """
+    headers = {}
+    if cached is not None:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    with session.get(url, headers=headers, stream=True,
+                     timeout=(min(URL_CONNECT_TIMEOUT, timeout), timeout)) as response:
+        if response.status_code == 304 and cached is not None:
+            return None
+        response.raise_for_status()
+
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > URL_MAX_BYTES:
+            raise PageTooLarge(f"{url}: {length} bytes")
+        body = bytearray()
+        for block in response.iter_content(64 * 1024):
+            body += block
+            if len(body) > URL_MAX_BYTES:
+                raise PageTooLarge(f"{url}: over {URL_MAX_BYTES} bytes")
+
+        charset = "charset" in response.headers.get("Content-Type", "").lower()
+        encoding = (response.encoding if charset else None) or "utf-8"
+        html = bytes(body).decode(encoding, errors="replace")
+        return html, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+
+def parse_html(url, html):
+    article = Article(url, config=Config())
+    article.download(input_html=html)
     article.parse()
     return article.text
+
+
+def _download(url, timeout):
+    cache = get_page_cache()
+    cached = cache.get(url)
+    fetched = fetch_html(url, timeout, cached)
+    if fetched is None:
+        cache.touch(url)
+        return cached["text"]
+
+    html, etag, last_modified = fetched
+    text = parse_html(url, html)
+    cache.put(url, etag, last_modified, html, text)
+    return text
+
+
+def extract_text_from_url(url, deadline=None):
+    """
+    Article text for url. Pages fetched in the last URL_CACHE_FRESH_SECONDS
+    come straight from the cache; older ones are revalidated, and served
+    stale if the site can't be reached.
+    """
+    cached = get_page_cache().get(url)
+    if cached is not None and time.time() - cached["fetched"] < URL_CACHE_FRESH_SECONDS:
+        return cached["text"]
+
+    timeout = dependency_timeout("newspaper", deadline)
+    try:
+        # one breaker per site, so a single broken publisher doesn't block the rest
+        return guarded_call("newspaper", _download, url, timeout, deadline=deadline,
+                            circuit_key=f"newspaper:{urlparse(url).netloc.lower()}")
+    except DependencyError:
+        if cached is not None:
+            return cached["text"]
+        raise
+
+
+def extract_many(urls, deadline=None):
+    """
+    {url: text} for many URLs, downloaded concurrently. URLs that fail
+    map to None.
+    """
+    def extract(url):
+        try:
+            return extract_text_from_url(url, deadline)
+        except Exception as e:
+            print(f"Error fetching article from {url}: {e}")
+            return None
+
+    unique = list(dict.fromkeys(urls))
+    return dict(zip(unique, executor.map(extract, unique)))
@@ -0,0 +1,19 @@
+import wikipedia
+
+from services.resilience import guarded_call
+from services.wiki_index import get_index
+
+
+def _summary(query):
+    try:
+        return wikipedia.summary(query, sentences=2)
+    except wikipedia.exceptions.WikipediaException:
+        # disambiguation / missing page: no entry, not an outage
+        return None
+
+
+def wiki_fact_check(query, deadline=None):
+    index = get_index()
+    if index is not None:
+        return index.lookup(query)
+    return guarded_call("wikipedia", _summary, query, fallback=None, deadline=deadline)
@@ -0,0 +1,190 @@
+import argparse
+import bz2
+import gzip
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from config import WIKI_INDEX_DB, WIKI_MIN_COVERAGE
+from utils.fts import match_query, query_terms
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _open_dump(path):
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rt", encoding="utf-8")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def lead_paragraph(title, text):
+    """
+    First real paragraph of an article body (wikiextractor repeats the
+    title as the first line).
+    """
+    for paragraph in re.split(r"\n\s*\n|\n", text or ""):
+        paragraph = paragraph.strip()
+        if paragraph and paragraph != title:
+            return paragraph
+    return ""
+
+
+def first_sentences(text, sentences=2):
+    return " ".join(SENTENCE_END.split(text.strip())[:sentences])
+
+
+def iter_dump(path):
+    """
+    (title, lead paragraph) pairs from a JSON-lines dump with "title" and
+    "text" fields, e.g. `wikiextractor --json` output, optionally .bz2/.gz.
+    """
+    with _open_dump(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            page = json.loads(line)
+            title = (page.get("title") or "").strip()
+            lead = lead_paragraph(title, page.get("text", ""))
+            if title and lead:
+                yield title, lead
+
+
+def build_index(dump_paths, db_path=WIKI_INDEX_DB, batch_size=5000):
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = db_path + ".building"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+
+    conn = sqlite3.connect(tmp)
+    conn.execute("CREATE VIRTUAL TABLE pages USING fts5(title, lead, tokenize='porter unicode61')")
+    count = 0
+    for path in dump_paths:
+        batch = []
+        for row in iter_dump(path):
+            batch.append(row)
+            if len(batch) == batch_size:
+                conn.executemany("INSERT INTO pages (title, lead) VALUES (?, ?)", batch)
+                count += len(batch)
+                batch = []
+        conn.executemany("INSERT INTO pages (title, lead) VALUES (?, ?)", batch)
+        count += len(batch)
+    conn.commit()
+    conn.execute("INSERT INTO pages (pages) VALUES ('optimize')")
+    conn.commit()
+    conn.close()
+    os.replace(tmp, db_path)
+    return count
+
+
+class WikiIndex:
+    """
+    Read-only BM25 lookup over Wikipedia lead paragraphs (SQLite FTS5).
+    """
+
+    def __init__(self, db_path=WIKI_INDEX_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def _search(self, query, limit):
+        expression = match_query(query)
+        if not expression:
+            return []
+        # title matches weigh five times more than body matches
+        return self._connect().execute(
+            "SELECT rowid, title, lead, bm25(pages, 5.0, 1.0) AS score FROM pages "
+            "WHERE pages MATCH ? ORDER BY score LIMIT ?",
+            (expression, limit),
+        ).fetchall()
+
+    def search(self, query, limit=5):
+        return [hit[1:] for hit in self._search(query, limit)]
+
+    def coverage(self, query, rowids):
+        """
+        {rowid: share of the query's terms the page contains}, matched the
+        way the index tokenizes them (stemmed, case-folded).
+        """
+        terms = query_terms(query)
+        matched = dict.fromkeys(rowids, 0)
+        if not terms or not rowids:
+            return {rowid: 0.0 for rowid in matched}
+        marks = ",".join("?" * len(rowids))
+        conn = self._connect()
+        for term in terms:
+            for (rowid,) in conn.execute(
+                f"SELECT rowid FROM pages WHERE pages MATCH ? AND rowid IN ({marks})",
+                (f'"{term}"', *rowids),
+            ):
+                matched[rowid] += 1
+        return {rowid: count / len(terms) for rowid, count in matched.items()}
+
+    def lookup(self, query, sentences=2, min_coverage=WIKI_MIN_COVERAGE):
+        """
+        Best-matching summary (like wikipedia.summary), or None when no
+        page contains at least `min_coverage` of the query's terms: a page
+        sharing one common word with the query isn't about it.
+        """
+        hits = self._search(query, limit=5)
+        coverage = self.coverage(query, [hit[0] for hit in hits])
+        for rowid, _, lead, _ in hits:
+            if coverage[rowid] >= min_coverage:
+                return first_sentences(lead, sentences)
+        return None
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index(db_path=WIKI_INDEX_DB):
+    """
+    The shared local index, or None when it hasn't been built.
+    """
+    global _index
+    with _index_lock:
+        if _index is None and os.path.exists(db_path):
+            _index = WikiIndex(db_path)
+        return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Wikipedia lead-paragraph index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="build the index from JSON-lines dump files")
+    build.add_argument("dumps", nargs="+")
+    build.add_argument("--db", default=WIKI_INDEX_DB)
+
+    query = sub.add_parser("query", help="look up the best-matching summary")
+    query.add_argument("text")
+    query.add_argument("--db", default=WIKI_INDEX_DB)
+
+    args = parser.parse_args()
+    if args.command == "build":
+        started = time.time()
+        count = build_index(args.dumps, args.db)
+        print(f"Indexed {count} pages into {args.db} in {time.time() - started:.1f}s")
+    else:
+        started = time.perf_counter()
+        summary = WikiIndex(args.db).lookup(args.text)
+        print(summary or "— no relevant entry found —")
+        print(f"({(time.perf_counter() - started) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
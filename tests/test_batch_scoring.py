@@ -0,0 +1,100 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import batch_scoring
+from services.credibility_score import compute_credibility_score
+from services.explainability import explain_prediction
+from services.final_decision import combined_verdict, final_verdict, strict_relax_decision
+from services.pipeline import RELAX, STRICT, build_analyses, build_analysis
+
+TEXTS = [
+    "The council approved the new budget on Tuesday after a long debate about road repairs.",
+    "SHOCKING: you won't believe this miracle cure doctors hate! Must see, it's going viral.",
+    "Experts recommend drinking water.",
+    "Breaking news: the secret truth exposed",
+    "",
+]
+
+
+def make_evidence(rng, result=None):
+    real_prob = float(rng.choice([0.0, 0.1, 0.425, 0.5, 0.575, 0.6, 0.75, 0.8, 0.9, 1.0, rng.random()]))
+    fake_prob = 1 - real_prob
+    if result is None:
+        result, confidence = ("Fake News", fake_prob) if fake_prob > real_prob else ("Real News", real_prob)
+    else:
+        confidence = 0.0
+    return {
+        "english_text": "Translated: shocking secret revealed in the capital.",
+        "detected_lang": str(rng.choice(["en", "unknown", "fr"])),
+        "translate": True,
+        "wiki_enabled": False,
+        "wiki_text": None,
+        "related": [{"title": str(n)} for n in range(int(rng.integers(0, 5)))],
+        "result": result,
+        "confidence": confidence,
+        "real_prob": real_prob,
+        "fake_prob": fake_prob,
+        "degraded": [],
+    }
+
+
+@pytest.mark.parametrize("mode", [RELAX, STRICT])
+def test_build_analyses_match_build_analysis(mode):
+    rng = np.random.default_rng(0)
+    rows = []
+    for n in range(300):
+        evidence = make_evidence(rng, result="No text provided" if n % 50 == 0 else None)
+        url = str(rng.choice(["", "https://www.bbc.com/news/1", "https://example.org/a"]))
+        status = str(rng.choice(["trusted", "suspicious", "unknown"]))
+        rows.append((evidence, TEXTS[n % len(TEXTS)], url, status, "example", None))
+
+    batched = build_analyses(rows, mode, enable_wiki=False)
+    for row, analysis in zip(rows, batched):
+        expected = build_analysis(*row[:5], mode, False, row[5])
+        del expected["time"], analysis["time"]
+        assert analysis == expected
+
+
+def test_vectorised_rules_match_scalar_rules():
+    probs = [0.0, 0.1, 0.4, 0.425, 0.5, 0.575, 0.6, 0.75, 0.8, 0.925, 1.0]
+    statuses = ["trusted", "suspicious", "unknown"]
+    cases = list(itertools.product(probs, range(5), statuses, [0, 15, 30, 45, 60, 100]))
+    real, related, status, clickbait = (np.array(column, dtype=object) for column in zip(*cases))
+    real = real.astype(float)
+    fake = 1 - real
+    related = related.astype(int)
+
+    scores = batch_scoring.credibility_scores(real, fake, related, status, clickbait.astype(float))
+    labels, confidences = batch_scoring.model_results(real, fake)
+    verdicts = batch_scoring.final_verdicts(labels, confidences, related, status)
+    levels = batch_scoring.clickbait_levels(clickbait.astype(int))
+    reasons = batch_scoring.reasons_from_codes(
+        batch_scoring.reason_codes(real, fake, related, status, levels))
+    for mode in [RELAX, STRICT]:
+        adjusted = batch_scoring.strict_relax_decisions(real, fake, mode)
+        assert [tuple(pair) for pair in zip(*adjusted)] == \
+            [strict_relax_decision(r, f, mode) for r, f in zip(real, fake)]
+
+    for n, (r, f, c, s, cb) in enumerate(zip(real, fake, related, status, clickbait)):
+        assert scores[n] == compute_credibility_score(r, f, c, s, cb)
+        assert verdicts[n] == final_verdict(labels[n], confidences[n], c, s)
+        assert reasons[n] == explain_prediction(r, f, c, s, levels[n])
+
+
+def test_combined_verdicts_match_scalar():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "real_prob": rng.random(200),
+        "related_count": rng.integers(0, 4, 200),
+        "domain_status": rng.choice(["trusted", "suspicious", "unknown"], 200),
+        "clickbait_score": rng.choice([0, 15, 30, 60], 200),
+        "text": [TEXTS[n % len(TEXTS)] for n in range(200)],
+    })
+    df["fake_prob"] = 1 - df["real_prob"]
+    scored = batch_scoring.score_batch(df)
+    for row, out in zip(df.itertuples(), scored.itertuples()):
+        assert out.verdict == combined_verdict(out.model_result, out.confidence, row.related_count,
+                                               row.domain_status, row.text)
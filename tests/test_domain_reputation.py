@@ -0,0 +1,73 @@
+import pytest
+
+from services.domain_reputation import DomainTrie, Reputation, ReputationRegistry, host_of
+
+
+@pytest.mark.parametrize("url,host", [
+    ("https://www.BBC.com/news/world", "bbc.com"),
+    ("bbc.com", "bbc.com"),
+    ("http://news.bbc.co.uk:8080/a?b=c", "news.bbc.co.uk"),
+    ("https://example.org./", "example.org"),
+    ("", ""),
+])
+def test_host_of(url, host):
+    assert host_of(url) == host
+
+
+def make_trie(*entries):
+    trie = DomainTrie()
+    for domain, status in entries:
+        trie.add(Reputation(domain, status, frozenset()))
+    return trie
+
+
+def test_trie_matches_whole_labels_only():
+    trie = make_trie(("bbc.com", "trusted"))
+    assert trie.lookup("bbc.com").status == "trusted"
+    assert trie.lookup("news.bbc.com").status == "trusted"
+    assert trie.lookup("notbbc.com") is None
+    assert trie.lookup("bbc.com.evil.xyz") is None
+    assert trie.lookup("com") is None
+
+
+def test_trie_most_specific_entry_wins():
+    trie = make_trie(("example.com", "trusted"), ("blogs.example.com", "suspicious"))
+    assert trie.lookup("example.com").status == "trusted"
+    assert trie.lookup("www2.example.com").status == "trusted"
+    assert trie.lookup("blogs.example.com").status == "suspicious"
+    assert trie.lookup("me.blogs.example.com").status == "suspicious"
+
+
+def test_registry_reads_statuses_and_tags(tmp_path):
+    path = tmp_path / "domains.txt"
+    path.write_text(
+        "; comment\n"
+        "bbc.com trusted american,uk\n"
+        "fakenews.example suspicious\n"
+        "foxnews.com unknown american\n",
+        encoding="utf-8",
+    )
+    registry = ReputationRegistry(str(path))
+    assert registry.status("https://www.bbc.com/x") == "trusted"
+    assert registry.status("https://fakenews.example/x") == "suspicious"
+    assert registry.status("https://foxnews.com/x") == "unknown"
+    assert registry.status("https://elsewhere.net/") == "unknown"
+    assert registry.domains(tag="american") == ["bbc.com", "foxnews.com"]
+    assert registry.domains(status="trusted", tag="american") == ["bbc.com"]
+
+
+def test_registry_keeps_previous_list_on_a_broken_edit(tmp_path):
+    path = tmp_path / "domains.txt"
+    path.write_text("bbc.com trusted\n", encoding="utf-8")
+    registry = ReputationRegistry(str(path))
+    path.write_text("bbc.com maybe\nanother line\n", encoding="utf-8")
+    registry._refresh(force=True)
+    assert registry.status("bbc.com") == "trusted"
+
+
+def test_shipped_list_trusts_only_the_baseline_sources():
+    registry = ReputationRegistry()
+    assert sorted(registry.domains(status="trusted")) == sorted([
+        "bbc.com", "reuters.com", "apnews.com", "thehindu.com", "ndtv.com",
+        "timesofindia.indiatimes.com", "cnn.com", "nytimes.com", "washingtonpost.com",
+    ])
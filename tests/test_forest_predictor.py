@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from services.forest_predictor import CompiledForest
+
+
+def make_data(seed=0, rows=2000, features=8):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, features))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(scale=0.5, size=rows) > 0).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize("n_estimators,max_depth", [(1, None), (25, 6), (60, None)])
+def test_predict_proba_is_bit_identical(n_estimators, max_depth):
+    X, y = make_data()
+    forest = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=0)
+    forest.fit(X, y)
+    compiled = CompiledForest.from_sklearn(forest)
+
+    X_test, _ = make_data(seed=1, rows=3000)
+    assert np.array_equal(compiled.predict_proba(X_test), forest.predict_proba(X_test))
+    assert np.array_equal(compiled.predict(X_test), forest.predict(X_test))
+
+
+def test_missing_values_follow_sklearn():
+    X, y = make_data()
+    rng = np.random.default_rng(2)
+    # trained with NaNs, so the trees learn where missing values go
+    X[rng.random(X.shape) < 0.1] = np.nan
+    forest = RandomForestClassifier(n_estimators=30, random_state=0).fit(X, y)
+    compiled = CompiledForest.from_sklearn(forest)
+
+    X_test, _ = make_data(seed=3, rows=3000)
+    X_test[rng.random(X_test.shape) < 0.2] = np.nan
+    X_test[:10] = np.nan
+    assert np.array_equal(compiled.predict_proba(X_test), forest.predict_proba(X_test))
+
+
+def test_chunking_and_save_load(tmp_path):
+    X, y = make_data()
+    forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    compiled = CompiledForest.from_sklearn(forest)
+    path = tmp_path / "forest.npz"
+    compiled.save(path)
+
+    loaded = CompiledForest.load(path)
+    assert np.array_equal(loaded.predict_proba(X, chunk_size=97), forest.predict_proba(X))
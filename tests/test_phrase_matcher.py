@@ -0,0 +1,61 @@
+import random
+import re
+from collections import Counter
+
+from services.explainability import CLICKBAIT_WORDS, clickbait_score, clickbait_score_batch
+from utils.phrase_matcher import PhraseMatcher, normalize
+
+PHRASES = CLICKBAIT_WORDS + ["must see this", "see", "the truth", "cure all"]
+
+
+def reference_count(phrases, text):
+    # one regex scan per phrase, whole words only
+    folded = normalize(text)
+    counts = Counter()
+    for phrase in {" ".join(normalize(p).split()) for p in phrases}:
+        pattern = r"(?<!\w)(?=" + re.escape(phrase) + r"(?!\w))"
+        counts[phrase] += len(re.findall(pattern, folded))
+    return +counts
+
+
+def test_matches_whole_words_only():
+    matcher = PhraseMatcher(CLICKBAIT_WORDS)
+    assert matcher.find("The truthful doctor") == []
+    assert [m[2] for m in matcher.find("The TRUTH, exposed!")] == ["truth", "exposed"]
+    assert matcher.find("secrets") == []
+
+
+def test_offsets_point_into_the_original_text():
+    text = "You won’t believe this MIRACLE cure"
+    matcher = PhraseMatcher(PHRASES)
+    for start, end, phrase in matcher.find(text):
+        assert normalize(text[start:end]) == phrase
+
+
+def test_curly_and_straight_apostrophes_match_alike():
+    matcher = PhraseMatcher(["you won't believe"])
+    assert len(matcher.find("You won’t believe it")) == 1
+
+
+def test_non_overlapping_keeps_the_longest_match():
+    matcher = PhraseMatcher(PHRASES)
+    text = "You must see this: the truth"
+    assert [m[2] for m in matcher.find(text)] == ["must see this", "must see", "see", "the truth", "truth"]
+    assert [m[2] for m in matcher.find(text, overlapping=False)] == ["must see this", "the truth"]
+
+
+def test_counts_match_a_regex_scan():
+    vocabulary = PHRASES + ["news", "truthful", "seen", "the", "all", "insanely", "cured", ",", "!"]
+    rng = random.Random(0)
+    matcher = PhraseMatcher(PHRASES)
+    for _ in range(300):
+        text = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 40)))
+        text = "".join(c.upper() if rng.random() < 0.1 else c for c in text)
+        assert matcher.count(text) == reference_count(PHRASES, text)
+
+
+def test_clickbait_batch_matches_scalar():
+    texts = ["SHOCKING secret cure exposed", "A calm report.", "", "Doctors hate this trick!"]
+    batch = clickbait_score_batch(texts)
+    for text, row in zip(texts, batch.itertuples()):
+        assert (row.cb_score, row.cb_level, row.cb_words) == clickbait_score(text)
@@ -0,0 +1,36 @@
+from services import pipeline
+from services.backends import stub_backends
+
+ARTICLE = " ".join(
+    f"The city council met on day {n} to discuss the budget for roads, schools and parks."
+    for n in range(12)
+)
+
+
+def translating_backends(name):
+    # "translates" by upper-casing, so each article's English text is recognisably its own
+    return stub_backends()._replace(name=name, translate=lambda text, deadline=None: (text.upper(), "fr"))
+
+
+def test_near_duplicate_keeps_its_own_text():
+    backends = translating_backends("test-near-duplicate")
+    first = pipeline.verify(ARTICLE, backends=backends)
+    edited = ARTICLE + " Shocking miracle cure exposed."
+    second = pipeline.verify(edited, backends=backends)
+
+    assert first["duplicate_similarity"] is None
+    assert second["duplicate_similarity"] is not None
+    assert second["news_text"] == edited.upper()
+    assert second["cb_score"] > first["cb_score"]
+    assert second["result"] == first["result"]
+
+
+def test_batch_near_duplicate_keeps_its_own_text():
+    backends = translating_backends("test-batch-near-duplicate")
+    pipeline.verify_batch([{"text": ARTICLE}], backends=backends)
+    edited = ARTICLE + " Shocking miracle cure exposed."
+    [analysis] = pipeline.verify_batch([{"text": edited}], backends=backends)
+
+    assert analysis["duplicate_similarity"] is not None
+    assert analysis["news_text"] == edited.upper()
+    assert "shocking" in analysis["cb_words"]
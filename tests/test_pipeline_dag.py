@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from utils.pipeline_dag import Stage, StageCache, check_graph, is_empty, run_stages
+
+
+def counting_stages(calls, finds=True):
+    def stage(name, func):
+        def run(*args):
+            calls.append(name)
+            return func(*args)
+        return run
+
+    return [
+        Stage("clean", ("text",), stage("clean", str.lower)),
+        Stage("words", ("clean",), stage("words", str.split)),
+        Stage("search", ("title",), stage("search", lambda title: [title] if finds else []), ttl=60),
+        Stage("report", ("words", "search"), stage("report", lambda words, hits: (len(words), len(hits)))),
+    ]
+
+
+def test_second_run_is_memoized():
+    calls, cache = [], StageCache()
+    stages = counting_stages(calls)
+    first = run_stages(stages, {"text": "A B C", "title": "t"}, cache)
+    ran = []
+    second = run_stages(stages, {"text": "A B C", "title": "t"}, cache, ran=ran)
+    assert ran == []
+    assert calls == ["clean", "words", "search", "report"]
+    assert first == second
+    assert second["report"] == (3, 1)
+
+
+def test_changing_one_input_only_reruns_downstream_stages():
+    calls, cache = [], StageCache()
+    stages = counting_stages(calls)
+    run_stages(stages, {"text": "A B C", "title": "t"}, cache)
+    ran = []
+    run_stages(stages, {"text": "A B C", "title": "other"}, cache, ran=ran)
+    assert ran == ["search", "report"]
+
+
+def test_version_separates_cached_outputs():
+    calls, cache = [], StageCache()
+    stages = counting_stages(calls)
+    run_stages(stages, {"text": "a", "title": "t"}, cache, version="1")
+    ran = []
+    run_stages(stages, {"text": "a", "title": "t"}, cache, version="2", ran=ran)
+    assert ran == ["clean", "words", "search", "report"]
+
+
+def test_empty_ttl_outputs_are_not_memoized():
+    calls, cache = [], StageCache()
+    stages = counting_stages(calls, finds=False)
+    run_stages(stages, {"text": "a", "title": "t"}, cache)
+    ran = []
+    values = run_stages(stages, {"text": "a", "title": "t"}, cache, ran=ran)
+    # the empty search is retried; "report" is memoized, its inputs didn't change
+    assert ran == ["search"]
+    assert values["search"] == []
+
+
+def test_ttl_expires():
+    cache = StageCache()
+    cache.set("key", "value", ttl=0.05)
+    assert cache.get("key") == (pytest.approx(time.monotonic() + 0.05, abs=0.05), "value")
+    time.sleep(0.06)
+    assert cache.get("key") is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = StageCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a")[1] == 1 and cache.get("c")[1] == 3
+
+
+def test_check_graph():
+    stages = counting_stages([])
+    check_graph(stages, ("text", "title"))
+    with pytest.raises(ValueError, match="reads"):
+        check_graph(stages, ("text",))
+    with pytest.raises(ValueError, match="twice"):
+        check_graph(stages + stages[:1], ("text", "title"))
+
+
+def test_is_empty():
+    assert is_empty([]) and is_empty([{}, {}]) and is_empty(("", None))
+    assert not is_empty([{}, {"title": "x"}]) and not is_empty(0.5)
@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from services import rate_limiter, resilience
+from services.rate_limiter import RateLimited, SharedRateLimiter
+
+LIMITS = {"search": {"rate": 2.0, "burst": 3, "max_concurrency": 4}}
+
+
+@pytest.fixture
+def limiter(tmp_path):
+    return SharedRateLimiter(str(tmp_path / "limits.sqlite3"), LIMITS)
+
+
+def test_burst_then_refill(limiter):
+    leases = [limiter.try_acquire("search")[0] for _ in range(3)]
+    assert all(leases)
+    lease, wait = limiter.try_acquire("search")
+    assert lease is None
+    assert 0 < wait <= 1 / LIMITS["search"]["rate"]
+
+
+def test_processes_share_one_quota(tmp_path):
+    first = SharedRateLimiter(str(tmp_path / "limits.sqlite3"), LIMITS)
+    second = SharedRateLimiter(str(tmp_path / "limits.sqlite3"), LIMITS)
+    assert first.try_acquire("search")[0] and first.try_acquire("search")[0]
+    assert second.try_acquire("search")[0]
+    assert second.try_acquire("search")[0] is None
+
+
+def test_acquire_gives_up_after_timeout(limiter):
+    for _ in range(3):
+        limiter.acquire("search")
+    with pytest.raises(RateLimited):
+        limiter.acquire("search", timeout=0.1)
+
+
+def test_concurrency_limit_holds_until_release(tmp_path):
+    limits = {"search": {"rate": 100.0, "burst": 100, "max_concurrency": 2}}
+    limiter = SharedRateLimiter(str(tmp_path / "limits.sqlite3"), limits)
+    first, second = limiter.acquire("search"), limiter.acquire("search")
+    assert limiter.try_acquire("search") == (None, 0.05)
+    limiter.release("search", first)
+    assert limiter.try_acquire("search")[0] is not None
+
+
+def test_aimd(limiter):
+    def released(ok, throttled=False):
+        limiter.release("search", limiter.acquire("search"), ok=ok, throttled=throttled)
+        return limiter.state("search")
+
+    assert limiter.state("search")["concurrency"] == 4
+    assert released(ok=False)["concurrency"] == 2
+    assert released(ok=True)["concurrency"] == 2.5
+    assert released(ok=None)["concurrency"] == 2.5
+    state = released(ok=False, throttled=True)
+    assert state["concurrency"] == 1.25
+    assert state["tokens"] < 1
+    assert state["in_flight"] == 0
+
+
+@pytest.fixture
+def guarded(tmp_path, monkeypatch):
+    limits = {"search": {"rate": 5.0, "burst": 1, "max_concurrency": 4}}
+    limiter = SharedRateLimiter(str(tmp_path / "limits.sqlite3"), limits)
+    monkeypatch.setattr(rate_limiter, "_limiter", limiter)
+    monkeypatch.setattr(resilience, "RATE_LIMITS", limits)
+    monkeypatch.setitem(resilience.DEPENDENCY_TIMEOUTS, "search", 0.3)
+    monkeypatch.setattr(resilience, "_breakers", {})
+    return limiter
+
+
+def test_waiting_for_a_slot_keeps_the_call_timeout_whole(guarded):
+    guarded.acquire("search")  # the only token: the next call waits ~0.2s for a refill
+    deadline = resilience.Deadline(5)
+    # the call takes 0.25s of its 0.3s timeout, after the wait
+    value = resilience.guarded_call("search", lambda: time.sleep(0.25) or "ok", fallback=None, deadline=deadline)
+    assert value == "ok"
+    assert deadline.degraded == []
+
+
+def test_rate_limited_calls_dont_open_the_breaker(guarded):
+    guarded.acquire("search")
+    for _ in range(resilience.breaker("search").threshold + 1):
+        deadline = resilience.Deadline(0.01)
+        assert resilience.guarded_call("search", lambda: "ok", fallback=None, deadline=deadline) is None
+        assert deadline.degraded[0][1] in ("rate limited", "deadline exceeded")
+    assert resilience.breaker("search").state == "closed"
+
+
+def test_timed_out_call_backs_off(guarded):
+    resilience.guarded_call("search", time.sleep, 0.5, fallback=None)
+    time.sleep(0.4)
+    state = guarded.state("search")
+    assert state["in_flight"] == 0
+    assert state["concurrency"] == 2
@@ -0,0 +1,69 @@
+import re
+import zlib
+
+import numpy as np
+import pytest
+
+from services import semantic_match
+from services.semantic_match import EmbeddingStore, calibrate_threshold, calibration, corroborating, load_pairs
+
+# held out from data/semantic-pairs.txt
+CLAIM = "Storms left half a million homes without power across the east coast on Monday."
+RELATED = {
+    "title": "Storm knocks out power to 500,000 homes on East Coast",
+    "snippet": "Utilities said about half a million customers lost electricity as the storm moved along the coast.",
+    "link": "https://example.com/related",
+}
+UNRELATED = {
+    "title": "Coastal town hosts annual kite festival",
+    "snippet": "Hundreds of visitors flew kites on the beach over the holiday weekend.",
+    "link": "https://example.com/unrelated",
+}
+
+STOPWORDS = set("a an the of to in on at by for and or as is was were be its it his her their with from after over "
+                "that this will said says".split())
+
+
+def bag_of_words(texts, dim=2048):
+    # a stand-in embedding: hashed word counts, L2-normalised
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in re.findall(r"[a-z]+", text.lower()):
+            if word not in STOPWORDS:
+                vectors[row, zlib.crc32(word[:5].encode()) % dim] += 1
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+
+
+def test_calibrate_threshold_splits_separable_scores():
+    assert 0.5 < calibrate_threshold([0.6, 0.7, 0.9], [0.1, 0.3, 0.5]) < 0.6
+
+
+def test_calibrate_threshold_misplaces_as_few_as_it_can():
+    related = [0.3, 0.6, 0.7, 0.8, 0.9]
+    unrelated = [0.1, 0.2, 0.35, 0.4, 0.55]
+    assert 0.55 < calibrate_threshold(related, unrelated) < 0.6
+
+
+def test_calibration_pairs_file():
+    pairs = load_pairs()
+    assert {related for related, _, _ in pairs} == {True, False}
+    assert all(claim and hit for _, claim, hit in pairs)
+
+
+def test_headlines_fall_on_either_side_of_the_calibrated_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr(semantic_match, "_store", EmbeddingStore(str(tmp_path), 2048))
+    threshold, related, unrelated = calibration(embed=bag_of_words)
+    assert np.median(related) > threshold > np.median(unrelated)
+
+    matched = corroborating(CLAIM, [RELATED, UNRELATED], threshold=threshold, embed=bag_of_words)
+    assert [article["link"] for article in matched] == [RELATED["link"]]
+
+
+def test_model_threshold_separates_headlines(tmp_path, monkeypatch):
+    # the real embedding model; skipped where it isn't installed
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    monkeypatch.setattr(semantic_match, "_store", None)
+    monkeypatch.setattr(semantic_match, "EMBEDDING_CACHE_DIR", str(tmp_path))
+    matched = corroborating(CLAIM, [RELATED, UNRELATED])
+    assert [article["link"] for article in matched] == [RELATED["link"]]
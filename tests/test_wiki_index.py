@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from services.wiki_index import WikiIndex, build_index
+
+PAGES = [
+    ("Mars", "Mars is the fourth planet from the Sun. It is often called the Red Planet. "
+             "Its surface has been explored by rovers."),
+    ("Apple Inc.", "Apple Inc. is an American technology company headquartered in Cupertino, California. "
+                   "It designs the iPhone."),
+    ("Paris", "Paris is the capital and largest city of France. It lies on the Seine."),
+]
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("wiki")
+    dump = directory / "dump.jsonl"
+    with open(dump, "w", encoding="utf-8") as f:
+        for title, lead in PAGES:
+            f.write(json.dumps({"title": title, "text": f"{title}\n\n{lead}"}) + "\n")
+    db_path = str(directory / "wiki.sqlite3")
+    assert build_index([str(dump)], db_path) == len(PAGES)
+    return WikiIndex(db_path)
+
+
+def test_lookup_finds_the_page_about_the_query(index):
+    summary = index.lookup("rovers explored surface of planet Mars")
+    assert summary.startswith("Mars is the fourth planet from the Sun.")
+
+
+def test_lookup_ignores_pages_sharing_one_common_word(index):
+    # "apple" matches Apple Inc., but the query isn't about the company
+    assert index.search("apple harvest smaller after spring frosts damaged orchard blossoms")
+    assert index.lookup("apple harvest smaller after spring frosts damaged orchard blossoms") is None
+
+
+def test_lookup_without_content_words(index):
+    assert index.lookup("the and of") is None
@@ -0,0 +1,31 @@
+import re
+
+# Words too common to help ranking; dropping them keeps OR queries cheap
+STOP_WORDS = frozenset("""
+a an and are as at be been but by for from has have he her his how i in is it
+its of on or she that the their them they this to was were what when where which
+who will with you your not no do does did so than then there these those into
+about after over said says also can could would should may might new
+""".split())
+
+
+def query_terms(text, max_terms=16):
+    """
+    The distinct content words of `text`, in order.
+    """
+    terms = []
+    for word in re.findall(r"\w+", text.lower()):
+        if len(word) < 2 or word in STOP_WORDS or word in terms:
+            continue
+        terms.append(word)
+        if len(terms) == max_terms:
+            break
+    return terms
+
+
+def match_query(text, max_terms=16):
+    """
+    FTS5 MATCH expression that ORs the distinct content words of `text`.
+    Returns "" when nothing usable is left.
+    """
+    return " OR ".join(f'"{term}"' for term in query_terms(text, max_terms))
@@ -0,0 +1,108 @@
+from collections import Counter, deque
+
+# Curly apostrophes and quotes are folded so "won’t" and "won't" match alike;
+# every replacement is one character, so offsets stay valid for the original
+FOLD = str.maketrans({"’": "'", "‘": "'", "“": '"', "”": '"'})
+
+
+def normalize(text):
+    return text.lower().translate(FOLD)
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of phrases: one pass over the
+    text finds every occurrence of every phrase, however many phrases
+    there are.
+
+    Matching is case-insensitive and only counts whole words, so "truth"
+    doesn't match inside "truthful".
+    """
+
+    def __init__(self, phrases):
+        self.phrases = []
+        seen = set()
+        for phrase in phrases:
+            phrase = " ".join(normalize(phrase).split())
+            if phrase and phrase not in seen:
+                seen.add(phrase)
+                self.phrases.append(phrase)
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for index, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (index,)
+
+        # Breadth-first so every state's failure target is final before its children's
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def find(self, text, overlapping=True):
+        """
+        Every whole-word occurrence as (start, end, phrase), in text order.
+
+        With overlapping=False, phrases inside a longer match are dropped
+        ("truth" within "the truth"), keeping the leftmost-longest ones.
+        """
+        folded = normalize(text)
+        goto, fail, out, phrases = self._goto, self._fail, self._out, self.phrases
+        size = len(folded)
+        matches = []
+        state = 0
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            if end < size and _is_word_char(folded[end]):
+                continue
+            for index in out[state]:
+                start = end - len(phrases[index])
+                if start > 0 and _is_word_char(folded[start - 1]):
+                    continue
+                matches.append((start, end, phrases[index]))
+        matches.sort(key=lambda m: (m[0], -m[1]))
+        if overlapping:
+            return matches
+
+        kept, covered = [], 0
+        for match in matches:
+            if match[0] >= covered:
+                kept.append(match)
+                covered = match[1]
+        return kept
+
+    def count(self, text, overlapping=True):
+        """
+        Counter of phrase -> number of occurrences.
+        """
+        return Counter(phrase for _, _, phrase in self.find(text, overlapping))